@@ -1,7 +1,10 @@
 import csv
 from django.contrib import admin
+from django.core.paginator import Paginator
 from django.http import HttpResponse
-from .models import Course, Intake
+from django.utils.functional import cached_property
+from .models import ArchivedIntake, Course, Intake
+from .typeahead import course_index
 
 # Export selected courses to CSV
 def export_courses_to_csv(modeladmin, request, queryset):
@@ -15,7 +18,7 @@ def export_courses_to_csv(modeladmin, request, queryset):
     writer = csv.writer(response)
     writer.writerow(['Course Name', 'Intake Start Date', 'Intake End Date'])
 
-    for course in queryset:
+    for course in queryset.prefetch_related('intakes'):
         for intake in course.intakes.all():
             writer.writerow([course.name, intake.start_date, intake.end_date])
 
@@ -23,6 +26,49 @@ def export_courses_to_csv(modeladmin, request, queryset):
 
 export_courses_to_csv.short_description = "Export selected courses to CSV"
 
+# Paginator that stops counting after a bound instead of running a full COUNT(*)
+class BoundedCountPaginator(Paginator):
+    """
+    Paginator for large changelists.
+    Counts at most `max_count` rows, so the pagination links reach the first
+    `max_count` results; narrow further with search, filters or the date hierarchy.
+    """
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        return self.object_list[:self.max_count].count()
+
+# Free-text course filter replacing the sidebar list of every course
+class CourseNameFilter(admin.SimpleListFilter):
+    """
+    Filter intakes by a course name prefix typed into the sidebar.
+    """
+    title = 'course'
+    parameter_name = 'course_name'
+    template = 'admin/admission/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(course__name__istartswith=self.value())
+        return queryset
+
+    def choices(self, changelist):
+        # A single "choice" carrying what the template needs to render the search box
+        yield {
+            'value': self.value() or '',
+            'other_params': [
+                (key, value) for key, value in changelist.params.items() if key != self.parameter_name
+            ],
+            'clear_query_string': changelist.get_query_string(remove=[self.parameter_name]),
+        }
+
 # Inline admin for managing intakes directly in the course admin page
 class IntakeInline(admin.TabularInline):
     """
@@ -41,6 +87,16 @@ class CourseAdmin(admin.ModelAdmin):
     search_fields = ['name']
     actions = [export_courses_to_csv]  # Register custom CSV export action
     inlines = [IntakeInline]  # Allows editing intakes directly in the course admin page
+    paginator = BoundedCountPaginator
+    show_full_result_count = False  # Skip the extra unfiltered COUNT(*) when searching
+    autocomplete_limit = 100  # Courses offered by the IntakeAdmin.course autocomplete
+
+    def get_search_results(self, request, queryset, search_term):
+        # The autocomplete widget (e.g. IntakeAdmin.course) is served from the prefix index
+        if search_term and request.path.endswith('/autocomplete/'):
+            matches = course_index.search(search_term, limit=self.autocomplete_limit)
+            return queryset.filter(id__in=[course_id for course_id, _ in matches]).order_by('name'), False
+        return super().get_search_results(request, queryset, search_term)
 
 # Register the Intake model
 @admin.register(Intake)
@@ -49,11 +105,34 @@ class IntakeAdmin(admin.ModelAdmin):
     Custom admin interface for Intake with search and filtering.
     """
     list_display = ['course', 'start_date', 'end_date']
-    list_filter = ['course', 'start_date', 'end_date']
+    list_select_related = ['course']  # Avoid a query per row for the course name
+    list_filter = [CourseNameFilter, 'start_date', 'end_date']
     search_fields = ['course__name', 'start_date', 'end_date']
     autocomplete_fields = ['course']  # Enable autocomplete on the course field
+    date_hierarchy = 'start_date'
+    paginator = BoundedCountPaginator
+    show_full_result_count = False  # Skip the extra unfiltered COUNT(*) when filtering
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "course":
             kwargs["queryset"] = Course.objects.all().order_by('name')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+# Register the ArchivedIntake model as read-only; rows are written by `manage.py archive_intakes`
+@admin.register(ArchivedIntake)
+class ArchivedIntakeAdmin(admin.ModelAdmin):
+    """
+    Read-only admin interface for archived intakes.
+    """
+    list_display = ['course', 'start_date', 'end_date', 'archived_at']
+    list_select_related = ['course']
+    list_filter = [CourseNameFilter]
+    date_hierarchy = 'start_date'
+    paginator = BoundedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
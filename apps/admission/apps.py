@@ -5,3 +5,6 @@ class AdmissionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.admission"
     label = "admission"
+
+    def ready(self):
+        from . import signals  # noqa: F401  Connect the change log receivers
@@ -0,0 +1,48 @@
+"""
+Fast deletion of courses with many intakes.
+
+Django's deletion collector loads every related Intake before deleting it. This
+path removes intakes with set-based DELETE statements in bounded chunks instead,
+and sends `intakes_bulk_deleted` per chunk in place of the per-object post_delete.
+"""
+from django.db import connection, transaction
+from .models import ArchivedIntake, Intake
+from .signals import intakes_bulk_deleted
+
+DELETE_CHUNK_SIZE = 1000
+
+
+def delete_intakes_in_chunks(model, course_id, chunk_size):
+    table = connection.ops.quote_name(model._meta.db_table)
+    deleted = 0
+    while True:
+        rows = list(
+            model.objects.filter(course_id=course_id).order_by('id').values_list('id', 'start_date')[:chunk_size]
+        )
+        if not rows:
+            return deleted
+        intake_ids = [intake_id for intake_id, _ in rows]
+        # The chunk holds every intake of the course between its first and last id
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE course_id = %s AND id BETWEEN %s AND %s',
+                [course_id, intake_ids[0], intake_ids[-1]],
+            )
+        intakes_bulk_deleted.send(
+            sender=model, course_id=course_id, intake_ids=intake_ids,
+            start_dates=[start_date for _, start_date in rows],
+        )
+        deleted += len(rows)
+
+
+def delete_course(course, chunk_size=DELETE_CHUNK_SIZE):
+    """
+    Delete a course with its current and archived intakes in one transaction,
+    without instantiating the intakes. Returns the number of intakes deleted.
+    The course itself is deleted normally and fires its own signals.
+    """
+    with transaction.atomic():
+        deleted = delete_intakes_in_chunks(Intake, course.pk, chunk_size)
+        deleted += delete_intakes_in_chunks(ArchivedIntake, course.pk, chunk_size)
+        course.delete()
+    return deleted
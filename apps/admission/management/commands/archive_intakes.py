@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from apps.admission.models import ArchivedIntake, Intake
+from apps.admission.signals import intakes_bulk_deleted
+
+
+class Command(BaseCommand):
+    """
+    Move intakes that ended before a cutoff date from the Intake table to ArchivedIntake.
+    Each chunk is copied and deleted in its own transaction with set-based statements;
+    `intakes_bulk_deleted` (with archived=True) is sent per course instead of post_delete.
+    Archived intakes leave the default API listings and appear as tombstones in the change feed.
+    """
+    help = "Archive intakes whose end date is before the cutoff (default: today)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', default=None,
+            help="Cutoff date (YYYY-MM-DD); intakes ending before it are archived. Defaults to today.",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Number of intakes moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = parse_date(options['before']) if options['before'] else timezone.localdate()
+        if cutoff is None:
+            raise CommandError("--before must be a date in YYYY-MM-DD format.")
+
+        table = connection.ops.quote_name(Intake._meta.db_table)
+        total = 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    Intake.objects.filter(end_date__lt=cutoff)
+                    .order_by('id')
+                    .values('id', 'course_id', 'start_date', 'end_date')[:options['chunk_size']]
+                )
+                if not rows:
+                    break
+                ArchivedIntake.objects.bulk_create([ArchivedIntake(**row) for row in rows])
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(rows))})",
+                        [row['id'] for row in rows],
+                    )
+                by_course = {}
+                for row in rows:
+                    by_course.setdefault(row['course_id'], []).append(row)
+                for course_id, course_rows in by_course.items():
+                    intakes_bulk_deleted.send(
+                        sender=Intake, course_id=course_id, intake_ids=[row['id'] for row in course_rows],
+                        start_dates=[row['start_date'] for row in course_rows], archived=True,
+                    )
+            total += len(rows)
+            self.stdout.write(f"Archived {total} intakes...")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} intakes ending before {cutoff}."))
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.admission.models import CatalogChange
+
+
+class Command(BaseCommand):
+    """
+    Remove tombstones older than the retention window from the catalog change log.
+    Sync clients holding a cursor older than the window are told to resync in full.
+    """
+    help = "Compact the catalog change log by deleting expired tombstones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help="Retention in days (defaults to settings.CATALOG_TOMBSTONE_RETENTION).",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Number of tombstones deleted per statement.",
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is not None:
+            retention = timedelta(days=options['days'])
+        else:
+            retention = settings.CATALOG_TOMBSTONE_RETENTION
+        cutoff = timezone.now() - retention
+        expired = CatalogChange.objects.filter(deleted=True, changed_at__lt=cutoff)
+
+        # Delete in bounded chunks to keep write locks short
+        total = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['chunk_size']])
+            if not ids:
+                break
+            total += CatalogChange.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {total} tombstones older than {cutoff:%Y-%m-%d %H:%M}."))
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_catalog_changes(apps, schema_editor):
+    """
+    Seed the change log with one entry per existing course and intake so a
+    sync starting from an empty cursor sees the whole catalog.
+    """
+    Course = apps.get_model('admission', 'Course')
+    Intake = apps.get_model('admission', 'Intake')
+    CatalogChange = apps.get_model('admission', 'CatalogChange')
+
+    CatalogChange.objects.bulk_create(
+        (CatalogChange(object_type='course', object_id=pk) for pk in Course.objects.values_list('id', flat=True).iterator()),
+        batch_size=1000,
+    )
+    CatalogChange.objects.bulk_create(
+        (
+            CatalogChange(object_type='intake', object_id=pk, course_id=course_id)
+            for pk, course_id in Intake.objects.values_list('id', 'course_id').iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0002_alter_course_name_alter_intake_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('course', 'Course'), ('intake', 'Intake')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('course_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['object_type', 'object_id'], name='admission_c_object__2aa70b_idx'), models.Index(fields=['deleted', 'changed_at'], name='admission_c_deleted_29e6c9_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_catalog_changes, migrations.RunPython.noop),
+    ]
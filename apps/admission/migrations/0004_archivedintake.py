@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0003_catalogchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIntake',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_intakes', to='admission.course')),
+            ],
+        ),
+    ]
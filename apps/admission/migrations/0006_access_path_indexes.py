@@ -0,0 +1,81 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:52
+
+import logging
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def fix_reversed_intake_dates(apps, schema_editor):
+    """
+    The API did not validate date order before the intake_end_after_start constraint,
+    so swap the dates of intakes ending before they start (almost certainly entered
+    the wrong way round) instead of failing halfway through the table rebuild.
+    """
+    Intake = apps.get_model('admission', 'Intake')
+    swapped = Intake.objects.filter(end_date__lt=models.F('start_date')).update(
+        start_date=models.F('end_date'), end_date=models.F('start_date'),
+    )
+    if swapped:
+        logger.warning("Swapped start and end dates of %s intakes ending before they start", swapped)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0005_catalogjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(fix_reversed_intake_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='archivedintake',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_intakes', to='admission.course'),
+        ),
+        migrations.AlterField(
+            model_name='intake',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='intakes', to='admission.course'),
+        ),
+        migrations.AlterField(
+            model_name='intake',
+            name='end_date',
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name='intake',
+            name='start_date',
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name='archivedintake',
+            index=models.Index(fields=['course', 'id'], name='archivedintake_course_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedintake',
+            index=models.Index(fields=['start_date', 'course'], name='archivedintake_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intake',
+            index=models.Index(fields=['course', 'id'], name='intake_course_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intake',
+            index=models.Index(fields=['course', 'start_date', 'end_date'], name='intake_course_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intake',
+            index=models.Index(fields=['start_date', 'course'], name='intake_start_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intake',
+            index=models.Index(fields=['end_date'], name='intake_end_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='intake',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gte', models.F('start_date'))), name='intake_end_after_start'),
+        ),
+    ]
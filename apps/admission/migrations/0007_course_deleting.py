@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0006_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='deleting',
+            field=models.BooleanField(default=False),
+        ),
+    ]
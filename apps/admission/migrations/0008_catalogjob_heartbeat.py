@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0007_course_deleting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='catalogjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
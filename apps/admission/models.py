@@ -1,16 +1,53 @@
+from django.conf import settings
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+class CourseManager(models.Manager):
+    """
+    Default manager hiding courses queued for asynchronous deletion.
+    Use `Course.all_objects` to reach them.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleting=False)
 
 class Course(models.Model):
     name = models.CharField(max_length=255, db_index=True)  # Index for faster name lookups
+    deleting = models.BooleanField(default=False)  # Queued for asynchronous deletion
+
+    objects = CourseManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.name
 
+    def intakes_with_archive(self):
+        """
+        Return current and archived intakes ordered by id.
+        Uses prefetched `intakes` and `archived_intakes` when available.
+        """
+        return sorted([*self.intakes.all(), *self.archived_intakes.all()], key=lambda intake: intake.id)
+
 class Intake(models.Model):
-    course = models.ForeignKey(Course, related_name='intakes', on_delete=models.CASCADE, db_index=True)  # Indexed FK
-    start_date = models.DateField(db_index=True)  # Indexed for faster date queries
-    end_date = models.DateField(db_index=True)
+    course = models.ForeignKey(Course, related_name='intakes', on_delete=models.CASCADE, db_index=False)  # Covered by the (course, id) index
+    start_date = models.DateField()
+    end_date = models.DateField()
+
+    class Meta:
+        indexes = [
+            # Intakes of a course in id order: ListIntakes, the with_intakes prefetch, cascade deletes
+            models.Index(fields=['course', 'id'], name='intake_course_id_idx'),
+            # Date ranges within a course, answered from the index alone
+            models.Index(fields=['course', 'start_date', 'end_date'], name='intake_course_dates_idx'),
+            # Calendar aggregation: start_date ranges grouped by course, answered from the index alone
+            models.Index(fields=['start_date', 'course'], name='intake_start_course_idx'),
+            # Archiving cutoff (`archive_intakes`)
+            models.Index(fields=['end_date'], name='intake_end_date_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(end_date__gte=models.F('start_date')), name='intake_end_after_start'),
+        ]
 
     def __str__(self):
         return f"{self.course.name}: {self.start_date} - {self.end_date}"
@@ -19,3 +56,89 @@ class Intake(models.Model):
         # Model-level validation for start and end date
         if self.end_date < self.start_date:
             raise ValidationError('End date cannot be earlier than start date.')
+
+class ArchivedIntake(models.Model):
+    """
+    Intake whose end date has passed, moved out of the Intake table by
+    `manage.py archive_intakes` so the hot table only holds current and future intakes.
+    Keeps the original intake id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    course = models.ForeignKey(Course, related_name='archived_intakes', on_delete=models.CASCADE, db_index=False)  # Covered by the (course, id) index
+    start_date = models.DateField()
+    end_date = models.DateField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Same access paths as Intake for `include_archived` listings and the calendar
+            models.Index(fields=['course', 'id'], name='archivedintake_course_id_idx'),
+            models.Index(fields=['start_date', 'course'], name='archivedintake_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.course.name}: {self.start_date} - {self.end_date} (archived)"
+
+class CatalogChange(models.Model):
+    """
+    Change log entry backing the delta sync feed.
+    Each live Course/Intake has exactly one entry (its latest change); deleted
+    objects keep a tombstone entry until it is compacted away.
+    The auto-incrementing id is the position in the feed.
+    """
+    COURSE = 'course'
+    INTAKE = 'intake'
+    OBJECT_TYPES = [(COURSE, 'Course'), (INTAKE, 'Intake')]
+
+    object_type = models.CharField(max_length=16, choices=OBJECT_TYPES)
+    object_id = models.BigIntegerField()
+    course_id = models.BigIntegerField(null=True, blank=True)  # Parent course, kept for intake tombstones
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'object_id']),  # Superseding previous entries on save/delete
+            models.Index(fields=['deleted', 'changed_at']),  # Tombstone compaction
+        ]
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f"{self.object_type} {self.object_id} {action} at {self.changed_at}"
+
+class CatalogJob(models.Model):
+    """
+    Bulk catalog write queued for a background worker (`manage.py run_jobs`).
+    `payload` holds the submitted items; progress and per-item errors are
+    written back as the worker processes them in chunks.
+    `attempts` counts claims and identifies the worker owning a running job;
+    `heartbeat_at` is refreshed after every chunk so abandoned jobs can be requeued.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUSES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (SUCCEEDED, 'Succeeded'), (FAILED, 'Failed')]
+
+    kind = models.CharField(max_length=32)
+    payload = models.JSONField(default=list)
+    status = models.CharField(max_length=16, choices=STATUSES, default=PENDING)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    succeeded = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id']),  # Workers claim the oldest pending job
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job {self.id} ({self.status})"
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from .models import CatalogChange, Course, Intake
+from .typeahead import course_index
+
+# Sent by the fast course delete path (apps.admission.deletion) and archive_intakes
+# instead of post_delete for every intake removed with a set-based DELETE.
+# Arguments: sender (Intake or ArchivedIntake), course_id, intake_ids, start_dates,
+# and archived=True when the intakes were moved to ArchivedIntake rather than deleted.
+intakes_bulk_deleted = Signal()
+
+
+def record_change(object_type, object_id, course_id=None, deleted=False):
+    """
+    Record the latest change for an object in the catalog change log.
+    Earlier entries for the same object are superseded, so the log holds one
+    entry per live object plus the tombstones of deleted ones.
+    """
+    CatalogChange.objects.filter(object_type=object_type, object_id=object_id).delete()
+    return CatalogChange.objects.create(
+        object_type=object_type, object_id=object_id, course_id=course_id, deleted=deleted
+    )
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_change(CatalogChange.COURSE, instance.pk)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    record_change(CatalogChange.COURSE, instance.pk, deleted=True)
+
+
+# The typeahead index only reflects committed changes
+@receiver(post_save, sender=Course)
+def course_index_saved(sender, instance, **kwargs):
+    pk, name = instance.pk, instance.name
+    if instance.deleting:
+        transaction.on_commit(lambda: course_index.remove(pk))
+    else:
+        transaction.on_commit(lambda: course_index.update(pk, name))
+
+
+@receiver(post_delete, sender=Course)
+def course_index_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: course_index.remove(pk))
+
+
+@receiver(post_save, sender=Intake)
+def intake_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_change(CatalogChange.INTAKE, instance.pk, course_id=instance.course_id)
+
+
+# Also fires for intakes removed by a cascading Course delete
+@receiver(post_delete, sender=Intake)
+def intake_deleted(sender, instance, **kwargs):
+    record_change(CatalogChange.INTAKE, instance.pk, course_id=instance.course_id, deleted=True)
+
+
+@receiver(intakes_bulk_deleted, sender=Intake)
+def intakes_bulk_deleted_tombstones(sender, course_id, intake_ids, **kwargs):
+    CatalogChange.objects.filter(object_type=CatalogChange.INTAKE, object_id__in=intake_ids).delete()
+    CatalogChange.objects.bulk_create([
+        CatalogChange(object_type=CatalogChange.INTAKE, object_id=intake_id, course_id=course_id, deleted=True)
+        for intake_id in intake_ids
+    ])
@@ -1,6 +1,19 @@
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.db.models.signals import post_delete
 from django.test import TestCase
-from .models import Course, Intake
-from datetime import date
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from unittest.mock import Mock, patch
+from .admin import BoundedCountPaginator
+from .deletion import delete_course
+from .signals import record_change
+from .typeahead import CoursePrefixIndex, course_index
+from .models import ArchivedIntake, CatalogChange, Course, Intake
+from datetime import date, timedelta
+from io import StringIO
 
 class CourseModelTest(TestCase):
     """
@@ -61,3 +74,274 @@ class IntakeModelTest(TestCase):
         expected_str = f"Test Course: {self.intake.start_date} - {self.intake.end_date}"
         self.assertEqual(str(self.intake), expected_str)
 
+
+class CatalogChangeTest(TestCase):
+    """
+    Test case for the catalog change log feeding the delta sync endpoint.
+    """
+
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course")
+
+    def test_save_supersedes_previous_entry(self):
+        """
+        Ensure that only the latest change is kept for a saved object.
+        """
+        self.course.name = "Renamed Course"
+        self.course.save()
+        changes = CatalogChange.objects.filter(object_type=CatalogChange.COURSE, object_id=self.course.id)
+        self.assertEqual(changes.count(), 1)
+        self.assertFalse(changes.get().deleted)
+
+    def test_delete_records_tombstones(self):
+        """
+        Ensure that deleting a course leaves tombstones for it and its cascaded intakes.
+        """
+        intake = Intake.objects.create(course=self.course, start_date=date.today(), end_date=date.today())
+        course_id = self.course.id
+        self.course.delete()
+        tombstone = CatalogChange.objects.get(object_type=CatalogChange.INTAKE, object_id=intake.id)
+        self.assertTrue(tombstone.deleted)
+        self.assertEqual(tombstone.course_id, course_id)
+        self.assertTrue(CatalogChange.objects.get(object_type=CatalogChange.COURSE, object_id=course_id).deleted)
+
+    def test_compaction_removes_expired_tombstones(self):
+        """
+        Ensure that compaction removes old tombstones and keeps live entries.
+        """
+        Course.objects.create(name="Deleted Course").delete()
+        CatalogChange.objects.filter(deleted=True).update(changed_at=timezone.now() - timedelta(days=365))
+        call_command('compact_catalog_changes', stdout=StringIO())
+        self.assertFalse(CatalogChange.objects.filter(deleted=True).exists())
+        self.assertTrue(CatalogChange.objects.filter(object_id=self.course.id, deleted=False).exists())
+
+
+class AdminChangelistTest(TestCase):
+    """
+    Test case for the Course and Intake admin changelists.
+    The number of queries must not grow with the number of rows displayed.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username="admin", password="password")
+        self.client.force_login(self.user)
+
+    def create_intakes(self, count):
+        for i in range(count):
+            course = Course.objects.create(name=f"Course {i}")
+            Intake.objects.create(course=course, start_date=date(2024, 1, 1), end_date=date(2024, 6, 30))
+
+    def count_changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_intake_changelist_query_count_is_constant(self):
+        """
+        Ensure that rendering more intakes does not issue more queries.
+        """
+        self.create_intakes(1)
+        baseline = self.count_changelist_queries(reverse('admin:admission_intake_changelist'))
+        self.create_intakes(20)
+        self.assertEqual(self.count_changelist_queries(reverse('admin:admission_intake_changelist')), baseline)
+
+    def test_course_changelist_query_count_is_constant(self):
+        """
+        Ensure that rendering more courses does not issue more queries.
+        """
+        self.create_intakes(1)
+        baseline = self.count_changelist_queries(reverse('admin:admission_course_changelist'))
+        self.create_intakes(20)
+        self.assertEqual(self.count_changelist_queries(reverse('admin:admission_course_changelist')), baseline)
+
+    def test_intake_course_name_filter(self):
+        """
+        Ensure that the course name filter narrows the intake changelist.
+        """
+        self.create_intakes(3)
+        url = reverse('admin:admission_intake_changelist')
+        response = self.client.get(url, {'course_name': 'Course 1'})
+        self.assertEqual(response.context['cl'].result_count, 1)
+        self.assertContains(response, 'name="course_name" value="Course 1"')
+
+    def test_intake_changelist_count_is_bounded(self):
+        """
+        Ensure that the result count stops at the paginator bound.
+        """
+        self.create_intakes(3)
+        with patch.object(BoundedCountPaginator, 'max_count', 2):
+            response = self.client.get(reverse('admin:admission_intake_changelist'))
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+
+class ArchiveIntakesCommandTest(TestCase):
+    """
+    Test case for the archive_intakes management command.
+    """
+
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course")
+        self.past = Intake.objects.create(course=self.course, start_date=date(2020, 1, 1), end_date=date(2020, 6, 30))
+        self.current = Intake.objects.create(course=self.course, start_date=date(2020, 1, 1), end_date=date(2099, 6, 30))
+
+    def test_archive_moves_ended_intakes(self):
+        """
+        Ensure that intakes ending before the cutoff move to the archive with their id.
+        """
+        call_command('archive_intakes', '--before', '2021-01-01', '--chunk-size', '1', stdout=StringIO())
+        self.assertEqual(list(Intake.objects.values_list('id', flat=True)), [self.current.id])
+        archived = ArchivedIntake.objects.get()
+        self.assertEqual((archived.id, archived.course_id, archived.end_date), (self.past.id, self.course.id, date(2020, 6, 30)))
+        self.assertEqual([i.id for i in self.course.intakes_with_archive()], [self.past.id, self.current.id])
+
+    def test_archive_uses_set_based_statements(self):
+        """
+        Ensure that archiving runs a bounded number of queries, writes tombstones
+        and leaves the intake calendar alone.
+        """
+        other_course = Course.objects.create(name="Other Course")
+        Intake.objects.bulk_create([
+            Intake(course=course, start_date=date(2020, 1, 1), end_date=date(2020, 6, 30))
+            for course in (self.course, other_course) for _ in range(50)
+        ])
+        with patch('apps.api.signals.bump_intake_calendar_version') as bump, CaptureQueriesContext(connection) as queries:
+            call_command('archive_intakes', '--before', '2021-01-01', stdout=StringIO())
+        self.assertLess(len(queries), 20)
+        bump.assert_not_called()
+        self.assertEqual(ArchivedIntake.objects.count(), 101)
+        self.assertEqual(CatalogChange.objects.filter(object_type=CatalogChange.INTAKE, deleted=True).count(), 101)
+
+    def test_archive_invalid_cutoff(self):
+        """
+        Ensure that an invalid cutoff date is rejected.
+        """
+        with self.assertRaises(CommandError):
+            call_command('archive_intakes', '--before', 'yesterday', stdout=StringIO())
+
+
+class CoursePrefixIndexTest(TestCase):
+    """
+    Test case for the in-process course name prefix index.
+    """
+
+    def setUp(self):
+        for name in ["Intro to Python", "Python for Data Science", "Écologie", "Java"]:
+            Course.objects.create(name=name)
+        self.index = CoursePrefixIndex()
+
+    def search_names(self, term, limit=10):
+        return [name for _, name in self.index.search(term, limit=limit)]
+
+    def test_search_ranks_leading_matches_first(self):
+        """
+        Ensure that names starting with the term come before later-word matches.
+        """
+        self.assertEqual(self.search_names("pyth"), ["Python for Data Science", "Intro to Python"])
+        self.assertEqual(self.search_names("pyth", limit=1), ["Python for Data Science"])
+
+    def test_search_is_normalized(self):
+        """
+        Ensure that case, accents and extra whitespace are ignored.
+        """
+        self.assertEqual(self.search_names("  ECO"), ["Écologie"])
+        self.assertEqual(self.search_names("data   sci"), ["Python for Data Science"])
+        self.assertEqual(self.search_names(""), [])
+
+    def test_index_follows_course_changes(self):
+        """
+        Ensure that committed renames and deletes update the shared index.
+        """
+        course_index.build()
+        course = Course.objects.get(name="Java")
+        with self.captureOnCommitCallbacks(execute=True):
+            course.name = "Kotlin"
+            course.save()
+        self.assertEqual(course_index.search("kot"), [(course.id, "Kotlin")])
+        self.assertEqual(course_index.search("java"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            course.delete()
+        self.assertEqual(course_index.search("kot"), [])
+
+    def test_sync_applies_changes_from_other_processes(self):
+        """
+        Ensure that changes only visible in the change log are picked up on sync.
+        """
+        self.index.build()
+        Course.objects.filter(name="Java").update(name="Rust")
+        record_change(CatalogChange.COURSE, Course.objects.get(name="Rust").id)
+        self.index.sync()
+        self.assertEqual(self.search_names("rust"), ["Rust"])
+
+    def test_admin_autocomplete_uses_index(self):
+        """
+        Ensure that the IntakeAdmin.course autocomplete returns prefix matches.
+        """
+        course_index.build()
+        self.client.force_login(User.objects.create_superuser(username="admin", password="password"))
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'term': 'pyth', 'app_label': 'admission', 'model_name': 'intake', 'field_name': 'course',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(result['text'] for result in response.json()['results']),
+            ["Intro to Python", "Python for Data Science"],
+        )
+
+
+class IntakeConstraintTest(TestCase):
+    """
+    Test case for the database-level intake date constraint.
+    """
+
+    def test_end_date_before_start_date_is_rejected(self):
+        """
+        Ensure that the database refuses an intake ending before it starts.
+        """
+        course = Course.objects.create(name="Test Course")
+        with self.assertRaises(IntegrityError):
+            Intake.objects.create(course=course, start_date=date(2024, 6, 1), end_date=date(2024, 1, 1))
+
+
+class FastCourseDeleteTest(TestCase):
+    """
+    Test case for the chunked, set-based course delete path.
+    """
+
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course")
+        for month in range(1, 8):
+            Intake.objects.create(course=self.course, start_date=date(2020, month, 1), end_date=date(2020, month, 28))
+        ArchivedIntake.objects.create(id=1000, course=self.course, start_date=date(2019, 1, 1), end_date=date(2019, 6, 30))
+        self.other_intake = Intake.objects.create(
+            course=Course.objects.create(name="Other Course"), start_date=date(2020, 1, 1), end_date=date(2020, 6, 30)
+        )
+
+    def test_delete_course_removes_intakes_without_loading_them(self):
+        """
+        Ensure that intakes are deleted in chunks without per-object delete signals.
+        """
+        intake_ids = list(self.course.intakes.values_list('id', flat=True))
+        per_object_receiver = Mock()
+        post_delete.connect(per_object_receiver, sender=Intake, weak=False)
+        try:
+            deleted = delete_course(self.course, chunk_size=3)
+        finally:
+            post_delete.disconnect(per_object_receiver, sender=Intake)
+        self.assertEqual(deleted, 8)
+        per_object_receiver.assert_not_called()
+        self.assertFalse(Course.all_objects.filter(name="Test Course").exists())
+        self.assertEqual(list(Intake.objects.values_list('id', flat=True)), [self.other_intake.id])
+        self.assertFalse(ArchivedIntake.objects.exists())
+
+        # Tombstones are still recorded through the bulk-delete hook
+        tombstones = CatalogChange.objects.filter(object_type=CatalogChange.INTAKE, deleted=True)
+        self.assertEqual(sorted(tombstones.values_list('object_id', flat=True)), intake_ids)
+
+    def test_delete_course_query_count_does_not_grow_per_intake(self):
+        """
+        Ensure that the number of queries depends on the chunk count, not the intake count.
+        """
+        with CaptureQueriesContext(connection) as context:
+            delete_course(self.course, chunk_size=1000)
+        self.assertLess(len(context.captured_queries), 20)
@@ -0,0 +1,162 @@
+"""
+In-process prefix index of course names for typeahead lookups.
+
+Normalized course names, and separately the suffixes starting at each later word,
+are kept in sorted lists, so "pyth" finds "Intro to Python" with one bisect.
+The index is built lazily, kept up to date by the Course save/delete signals of
+this process and catches up with changes made by other processes by replaying
+the catalog change log.
+"""
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db.models import Max
+from .models import CatalogChange, Course
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(text):
+    """
+    Case-fold, strip accents and collapse whitespace.
+    """
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return WHITESPACE.sub(' ', text.casefold()).strip()
+
+
+def index_keys(name):
+    """
+    Return the normalized name and the suffixes starting at each of its later words.
+    """
+    normalized = normalize(name)
+    words = normalized.split(' ')
+    return normalized, [' '.join(words[i:]) for i in range(1, len(words))]
+
+
+class CoursePrefixIndex:
+    """
+    Sorted arrays of (key, course id) pairs searched with bisect.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.full_names = []  # Sorted (normalized name, course id)
+        self.suffixes = []  # Sorted (normalized name from its second word on, course id)
+        self.names = {}  # course id -> display name
+        self.built = False
+        self.last_change_id = 0  # Last CatalogChange applied
+        self.synced_at = 0.0
+
+    def build(self):
+        """
+        Rebuild the whole index from the database.
+        """
+        last_change_id = CatalogChange.objects.aggregate(last=Max('id'))['last'] or 0
+        names = dict(Course.objects.values_list('id', 'name').iterator())
+        full_names, suffixes = [], []
+        for course_id, name in names.items():
+            full_name, name_suffixes = index_keys(name)
+            full_names.append((full_name, course_id))
+            suffixes.extend((suffix, course_id) for suffix in name_suffixes)
+        full_names.sort()
+        suffixes.sort()
+        with self.lock:
+            self.full_names, self.suffixes, self.names = full_names, suffixes, names
+            self.last_change_id = last_change_id
+            self.synced_at = time.monotonic()
+            self.built = True
+
+    @staticmethod
+    def _discard(entries, entry):
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def _remove(self, course_id):
+        name = self.names.pop(course_id, None)
+        if name is None:
+            return
+        full_name, suffixes = index_keys(name)
+        self._discard(self.full_names, (full_name, course_id))
+        for suffix in suffixes:
+            self._discard(self.suffixes, (suffix, course_id))
+
+    def _add(self, course_id, name):
+        self.names[course_id] = name
+        full_name, suffixes = index_keys(name)
+        insort(self.full_names, (full_name, course_id))
+        for suffix in suffixes:
+            insort(self.suffixes, (suffix, course_id))
+
+    def update(self, course_id, name):
+        """
+        Insert or replace one course.
+        """
+        with self.lock:
+            if self.built:
+                self._remove(course_id)
+                self._add(course_id, name)
+
+    def remove(self, course_id):
+        """
+        Drop one course.
+        """
+        with self.lock:
+            if self.built:
+                self._remove(course_id)
+
+    def sync(self):
+        """
+        Apply course changes recorded by other processes since the last sync.
+        Falls back to a full rebuild if tombstones may have been compacted meanwhile.
+        """
+        if time.monotonic() - self.synced_at > settings.CATALOG_TOMBSTONE_RETENTION.total_seconds():
+            return self.build()
+        changes = list(
+            CatalogChange.objects.filter(id__gt=self.last_change_id, object_type=CatalogChange.COURSE)
+            .order_by('id')
+            .values_list('id', 'object_id', 'deleted')
+        )
+        names = dict(Course.objects.filter(id__in=[c[1] for c in changes if not c[2]]).values_list('id', 'name'))
+        with self.lock:
+            for _, course_id, deleted in changes:
+                self._remove(course_id)
+                if not deleted and course_id in names:
+                    self._add(course_id, names[course_id])
+            if changes:
+                self.last_change_id = changes[-1][0]
+            self.synced_at = time.monotonic()
+
+    def ensure_fresh(self):
+        if not self.built:
+            self.build()
+        elif time.monotonic() - self.synced_at > settings.COURSE_TYPEAHEAD_SYNC_INTERVAL:
+            self.sync()
+
+    def search(self, term, limit=10):
+        """
+        Return up to `limit` (id, name) pairs whose name has a word starting with `term`.
+        Names starting with `term` come first in alphabetical order, followed by
+        names with a later word matching. Only the returned matches are visited.
+        """
+        prefix = normalize(term)
+        if not prefix or limit < 1:
+            return []
+        self.ensure_fresh()
+        matches = {}
+        with self.lock:
+            for entries in (self.full_names, self.suffixes):
+                position = bisect_left(entries, (prefix,))
+                while position < len(entries) and len(matches) < limit and entries[position][0].startswith(prefix):
+                    course_id = entries[position][1]
+                    matches.setdefault(course_id, self.names[course_id])
+                    position += 1
+        return list(matches.items())
+
+
+course_index = CoursePrefixIndex()
@@ -5,3 +5,6 @@ class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.api"
     label = "api"
+
+    def ready(self):
+        from . import signals  # noqa: F401  Connect the cache invalidation receivers
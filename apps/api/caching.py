@@ -0,0 +1,57 @@
+"""
+Shared caching of detail responses.
+
+A detail response is the same for every user allowed to see it, so users are
+grouped by permission scope (the same scope request coalescing uses) and all
+viewers share one cache entry per object and query string. Users lacking the
+view permission bypass the cache and get the view's usual 404/403 answer.
+
+Entries are keyed by a per-object version that the signals in apps.api.signals
+bump whenever that object (or, for courses, one of their intakes) changes, so
+edits invalidate only the affected objects. The version keys live in the
+configured cache backend; run several workers against a shared backend (e.g.
+Redis or Memcached) so every worker sees the invalidations.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from .coalescing import request_key
+from .signals import detail_version_key
+
+
+def cache_detail(model_name, perm, lookup, parent=None):
+    """
+    Decorate a detail view's `get` to cache its 200 responses for holders of `perm`.
+    `lookup` names the URL keyword argument carrying the object id. With
+    `parent=(model name, lookup)` entries also depend on the parent object's
+    version, so invalidating a course invalidates all of its intakes at once.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not request.user.has_perm(perm):
+                return method(view, request, *args, **kwargs)
+
+            object_id = kwargs[lookup]
+            version = cache.get_or_set(detail_version_key(model_name, object_id), time.time_ns, None)
+            if parent is not None:
+                parent_name, parent_lookup = parent
+                parent_version = cache.get_or_set(detail_version_key(parent_name, kwargs[parent_lookup]), time.time_ns, None)
+                version = f"{parent_version}.{version}"
+            scope = hashlib.sha256(request_key(request, (perm,)).encode()).hexdigest()
+            cache_key = f"detail:{model_name}:{object_id}:{version}:{scope}"
+            data = cache.get(cache_key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(cache_key, response.data, settings.API_DETAIL_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
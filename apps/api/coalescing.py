@@ -0,0 +1,188 @@
+"""
+Single-flight coalescing of identical GET requests.
+
+When many clients ask for the same page at once, only the first request (the
+leader) runs the view; identical requests arriving while it is in flight wait
+for it and reuse its status and data instead of repeating the queries and
+serialization. Requests are identical when they share the host, path, normalized
+query parameters, renderer format and permission scope. Nothing is kept once the
+leader finishes, so coalescing never serves stale data.
+
+With settings.API_COALESCE_LOCK_DIR set, leaders in different worker processes
+also coordinate through one lock file per request key: the worker holding the
+lock computes the response and writes it into the file, the others wait for the
+lock and read it back.
+"""
+import hashlib
+import json
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows): coalesce within each process only
+    fcntl = None
+
+COALESCED_HEADER = 'X-Coalesced'
+LOCK_POLL_INTERVAL = 0.01
+PRUNE_INTERVAL = 60  # Seconds between sweeps of stale lock files
+
+
+def request_key(request, perms=()):
+    """
+    Identify a GET request by host, path, sorted query parameters, renderer format and
+    permission scope: the subset of `perms` the user holds, or just whether they are
+    authenticated when the view checks no model permission.
+    """
+    params = '&'.join(
+        f'{name}={value}' for name, values in sorted(request.query_params.lists()) for value in values
+    )
+    if perms:
+        scope = ','.join(perm for perm in perms if request.user.has_perm(perm))
+    else:
+        scope = 'authenticated' if request.user.is_authenticated else 'anonymous'
+    renderer = getattr(request, 'accepted_renderer', None)
+    return f"{request.get_host()}{request.path}?{params}|{getattr(renderer, 'format', '')}|{scope}"
+
+
+class InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time and hand its result to concurrent callers.
+    """
+
+    def __init__(self, lock_dir=None):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.lock_dir = Path(lock_dir) if lock_dir and fcntl is not None else None
+        self.pruned_at = time.monotonic()
+
+    def do(self, key, fn, timeout=10):
+        """
+        Return (result, shared). `fn` must return a JSON-serializable (status, data) pair
+        when a lock directory is configured. Followers that time out, or whose leader
+        failed, run `fn` themselves.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = InFlight()
+
+        if not leader:
+            if call.done.wait(timeout) and not call.failed:
+                return call.result, True
+            return fn(), False
+
+        try:
+            call.result, shared = self.across_workers(key, fn, timeout) if self.lock_dir else (fn(), False)
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, shared
+
+    def across_workers(self, key, fn, timeout):
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.prune()
+        path = self.lock_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.lock"
+        started = time.time()
+        with open(path, 'a+b') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is computing this response: wait for it and read its result
+                record = self.read_when_unlocked(f, timeout)
+                if record is not None and record['written_at'] >= started:
+                    return (record['status'], record['data']), True
+                return fn(), False
+            try:
+                result = fn()
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(
+                    {'written_at': time.time(), 'status': result[0], 'data': result[1]}, cls=JSONEncoder
+                ).encode())
+                f.flush()
+                return result, False
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def read_when_unlocked(f, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            f.seek(0)
+            return json.loads(f.read())
+        except ValueError:  # Empty or partially written file
+            return None
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def prune(self):
+        """
+        Every PRUNE_INTERVAL seconds, remove lock files nobody has used for a while.
+        """
+        now = time.monotonic()
+        if now - self.pruned_at < PRUNE_INTERVAL:
+            return
+        self.pruned_at = now
+        cutoff = time.time() - PRUNE_INTERVAL
+        for path in self.lock_dir.glob('*.lock'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+flight = SingleFlight(settings.API_COALESCE_LOCK_DIR)
+
+
+def coalesce(*perms):
+    """
+    Decorate a view's `get` so identical concurrent requests share one computation.
+    `perms` are the model permissions the view checks; they define the permission scope.
+    The leader returns its own response, followers a copy of its status and data.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            own = {}
+
+            def compute():
+                own['response'] = method(view, request, *args, **kwargs)
+                return own['response'].status_code, own['response'].data
+
+            (status_code, data), shared = flight.do(request_key(request, perms), compute, settings.API_COALESCE_TIMEOUT)
+            if 'response' in own:
+                return own['response']
+            response = Response(data, status=status_code)
+            if shared:
+                response[COALESCED_HEADER] = '1'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,222 @@
+"""
+Background processing of bulk catalog writes.
+
+Bulk endpoints (and asynchronous course deletion) store the submitted items as a
+CatalogJob and return immediately; `manage.py run_jobs` workers claim pending jobs
+from the database and apply the items in chunked transactions, recording progress
+and per-item errors on the job.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.admission.deletion import delete_course
+from apps.admission.models import CatalogJob, Course, Intake
+from .serializers import CourseSerializer, IntakeSerializer
+
+logger = logging.getLogger(__name__)
+
+JOB_CHUNK_SIZE = 200  # Items applied per transaction
+MAX_STORED_ERRORS = 100  # Per-item errors kept on the job; the `failed` count stays exact
+
+
+INVALID_ID = ["A valid integer is required."]
+
+
+class ClaimLost(Exception):
+    """
+    The job was requeued as stale and claimed by another worker.
+    """
+
+
+def parse_id(value):
+    """
+    Return `value` as an integer id, or None when it is not one.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def save_course(item):
+    """
+    Create a course, or rename it when the item carries an `id`.
+    Returns the validation errors, or None on success.
+    """
+    instance = None
+    if item.get('id') is not None:
+        course_id = parse_id(item['id'])
+        if course_id is None:
+            return {"id": INVALID_ID}
+        instance = Course.objects.filter(id=course_id).first()
+        if instance is None:
+            return {"detail": "Not found."}
+    serializer = CourseSerializer(instance, data=item, exclude_intakes=True)
+    if not serializer.is_valid():
+        return serializer.errors
+    serializer.save()
+    return None
+
+
+def save_intake(item):
+    """
+    Create an intake for `course_id`, or update it when the item carries an `id`.
+    Returns the validation errors, or None on success.
+    """
+    course_id = parse_id(item.get('course_id'))
+    if course_id is None:
+        return {"course_id": INVALID_ID}
+    course = Course.objects.filter(id=course_id).first()
+    if course is None:
+        return {"course_id": ["Course not found."]}
+    instance = None
+    if item.get('id') is not None:
+        intake_id = parse_id(item['id'])
+        if intake_id is None:
+            return {"id": INVALID_ID}
+        instance = Intake.objects.filter(id=intake_id, course=course).first()
+        if instance is None:
+            return {"detail": "Not found."}
+    serializer = IntakeSerializer(instance, data=item)
+    if not serializer.is_valid():
+        return serializer.errors
+    serializer.save(course=course)
+    return None
+
+
+def delete_course_job(item):
+    """
+    Delete a course queued by `DeleteCourse?async=true`.
+    """
+    course_id = parse_id(item.get('id'))
+    if course_id is None:
+        return {"id": INVALID_ID}
+    course = Course.all_objects.filter(id=course_id).first()
+    if course is None:
+        return {"detail": "Not found."}
+    delete_course(course)
+    return None
+
+
+JOB_HANDLERS = {
+    'bulk_courses': save_course,
+    'bulk_intakes': save_intake,
+    'delete_course': delete_course_job,
+}
+
+
+def requeue_stale_jobs():
+    """
+    Put running jobs whose worker stopped sending heartbeats back in the queue.
+    They resume after their last committed chunk.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CATALOG_JOB_STALE_TIMEOUT)
+    requeued = CatalogJob.objects.filter(status=CatalogJob.RUNNING, heartbeat_at__lt=cutoff).update(status=CatalogJob.PENDING)
+    if requeued:
+        logger.warning("Requeued %s stale catalog jobs", requeued)
+    return requeued
+
+
+def claim_next_job():
+    """
+    Mark the oldest pending job as running and return it, or None if the queue is empty.
+    The conditional UPDATE makes the claim safe across worker threads and processes.
+    """
+    requeue_stale_jobs()
+    while True:
+        job_id = CatalogJob.objects.filter(status=CatalogJob.PENDING).order_by('id').values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = CatalogJob.objects.filter(id=job_id, status=CatalogJob.PENDING).update(
+            status=CatalogJob.RUNNING, started_at=now, heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return CatalogJob.objects.get(id=job_id)
+
+
+def save_progress(job, **fields):
+    """
+    Write job fields and a fresh heartbeat, unless another worker has claimed the job since.
+    """
+    job.heartbeat_at = timezone.now()
+    updated = CatalogJob.objects.filter(id=job.id, attempts=job.attempts).update(heartbeat_at=job.heartbeat_at, **fields)
+    if not updated:
+        raise ClaimLost
+
+
+def run_job(job):
+    """
+    Apply the items of a claimed job, starting after the last committed chunk.
+    Progress is saved in each chunk's transaction and counted only once it commits.
+    """
+    handler = JOB_HANDLERS[job.kind]
+    items = job.payload
+    try:
+        for offset in range(job.processed, len(items), JOB_CHUNK_SIZE):
+            chunk = items[offset:offset + JOB_CHUNK_SIZE]
+            succeeded = failed = 0
+            errors = list(job.errors)
+            with transaction.atomic():
+                for index, item in enumerate(chunk, start=offset):
+                    with transaction.atomic():  # Savepoint, so one bad item does not abort the chunk
+                        item_errors = handler(item)
+                    if item_errors:
+                        failed += 1
+                        if len(errors) < MAX_STORED_ERRORS:
+                            errors.append({"index": index, "errors": item_errors})
+                    else:
+                        succeeded += 1
+                save_progress(
+                    job, processed=offset + len(chunk), succeeded=job.succeeded + succeeded,
+                    failed=job.failed + failed, errors=errors,
+                )
+            job.processed = offset + len(chunk)
+            job.succeeded += succeeded
+            job.failed += failed
+            job.errors = errors
+        job.status = CatalogJob.SUCCEEDED
+    except ClaimLost:
+        logger.warning("Catalog job %s was claimed by another worker", job.id)
+        return job
+    except Exception as e:
+        logger.exception("Catalog job %s failed", job.id)
+        job.status = CatalogJob.FAILED
+        job.errors.append({"index": job.processed, "errors": {"detail": str(e)}})
+        if job.kind == 'delete_course':
+            # The delete rolled back, so show the courses again instead of hiding them forever
+            course_ids = [parse_id(item.get('id')) for item in items[job.processed:]]
+            for course in Course.all_objects.filter(id__in=[i for i in course_ids if i is not None], deleting=True):
+                course.deleting = False
+                course.save(update_fields=['deleting'])  # Fires the cache and calendar invalidation
+    job.finished_at = timezone.now()
+    try:
+        save_progress(job, status=job.status, errors=job.errors, finished_at=job.finished_at)
+    except ClaimLost:
+        logger.warning("Catalog job %s was claimed by another worker", job.id)
+    return job
+
+
+def work(stop_event=None, poll_interval=1.0, once=False):
+    """
+    Worker loop: run jobs until the queue is empty (once=True) or `stop_event` is set.
+    """
+    while stop_event is None or not stop_event.is_set():
+        close_old_connections()
+        job = claim_next_job()
+        if job is not None:
+            run_job(job)
+        elif once:
+            return
+        elif stop_event is not None:
+            stop_event.wait(poll_interval)
+        else:
+            time.sleep(poll_interval)
@@ -0,0 +1,311 @@
+"""
+Load-test harness for the API.
+
+Replays a weighted mix of API operations with N concurrent virtual clients, either
+against a live server over HTTP or in-process through Django's request handler,
+and reports throughput, latency percentiles, error rates and SQLite lock errors.
+Driven by `manage.py loadtest`.
+"""
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+
+COURSES_URL = '/api/admission/courses/'
+
+DEFAULT_MIX = {
+    'token': 1,
+    'list_courses': 4,
+    'list_courses_with_intakes': 3,
+    'retrieve_course': 4,
+    'create_course': 1,
+    'update_course': 1,
+    'delete_course': 1,
+    'list_intakes': 3,
+    'retrieve_intake': 3,
+    'create_intake': 1,
+    'update_intake': 1,
+    'delete_intake': 1,
+}
+
+LOCK_ERROR_MARKER = b'database is locked'
+
+
+@dataclass
+class Scenario:
+    """
+    Traffic shape for a load test run.
+    `mix` maps operation names (see VirtualClient.operations) to relative weights.
+    """
+    username: str = ''
+    password: str = ''
+    clients: int = 4
+    duration: float = 10.0
+    requests_per_client: int | None = None
+    mix: dict = field(default_factory=lambda: dict(DEFAULT_MIX))
+    url: str | None = None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        unknown = set(data) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown scenario keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def validate(self):
+        unknown = set(self.mix) - set(VirtualClient.operations)
+        if unknown:
+            raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+        if not any(weight > 0 for weight in self.mix.values()):
+            raise ValueError("The operation mix needs at least one positive weight.")
+        if self.clients < 1:
+            raise ValueError("At least one client is required.")
+
+
+class HttpTransport:
+    """
+    Sends requests to a live server.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, token=None, data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        request.add_header('Content-Type', 'application/json')
+        if token:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class InProcessTransport:
+    """
+    Sends requests through Django's request handler in this process, including middleware.
+    """
+
+    def __init__(self):
+        # Use a concrete allowed host; with an empty ALLOWED_HOSTS, DEBUG accepts localhost
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+        self.client = Client(HTTP_HOST=host)
+
+    def request(self, method, path, token=None, data=None):
+        extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        body = json.dumps(data) if data is not None else ''
+        response = self.client.generic(method, path, body, content_type='application/json', **extra)
+        return response.status_code, response.content
+
+
+class Stats:
+    """
+    Thread-safe collector of request samples.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)  # operation -> [(latency seconds, status, lock error)]
+
+    def record(self, operation, latency, status, locked):
+        with self.lock:
+            self.samples[operation].append((latency, status, locked))
+
+    @staticmethod
+    def percentile(sorted_values, pct):
+        if not sorted_values:
+            return 0.0
+        index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+        return sorted_values[index]
+
+    def summarize(self, samples, elapsed):
+        latencies = sorted(latency for latency, _, _ in samples)
+        errors = sum(1 for _, status, _ in samples if status == 0 or status >= 400)
+        return {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(self.percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(self.percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(self.percentile(latencies, 99) * 1000, 2),
+            'errors': errors,
+            'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+            'lock_errors': sum(1 for _, _, locked in samples if locked),
+        }
+
+    def report(self, elapsed):
+        with self.lock:
+            operations = {name: self.summarize(samples, elapsed) for name, samples in sorted(self.samples.items())}
+            total = self.summarize([sample for samples in self.samples.values() for sample in samples], elapsed)
+        return {'elapsed_s': round(elapsed, 2), 'total': total, 'operations': operations}
+
+
+class VirtualClient:
+    """
+    One simulated API consumer running the scenario's operation mix in its own thread.
+    Courses and intakes it creates are the ones it later updates and deletes;
+    intakes are added to the shared courses or to its own.
+    """
+    operations = [
+        'token', 'list_courses', 'list_courses_with_intakes', 'retrieve_course',
+        'create_course', 'update_course', 'delete_course',
+        'list_intakes', 'retrieve_intake', 'create_intake', 'update_intake', 'delete_intake',
+    ]
+
+    def __init__(self, transport, scenario, stats, course_ids, seed=None):
+        self.transport = transport
+        self.scenario = scenario
+        self.stats = stats
+        self.course_ids = course_ids  # Shared pool of ids to retrieve
+        self.created_ids = []
+        self.created_intakes = []  # (course id, intake id)
+        self.token = None
+        self.random = random.Random(seed)
+        names = [name for name, weight in scenario.mix.items() if weight > 0]
+        self.mix = (names, [scenario.mix[name] for name in names])
+
+    def call(self, operation, method, path, data=None):
+        start = time.perf_counter()
+        try:
+            status, body = self.transport.request(method, path, token=self.token, data=data)
+        except Exception as e:
+            status, body = 0, str(e).encode()
+        latency = time.perf_counter() - start
+        self.stats.record(operation, latency, status, status in (0, 500) and LOCK_ERROR_MARKER in body)
+        return status, body
+
+    def run(self, deadline):
+        try:
+            self.token_op()
+            done = 0
+            while time.monotonic() < deadline:
+                if self.scenario.requests_per_client is not None and done >= self.scenario.requests_per_client:
+                    break
+                operation = self.random.choices(*self.mix)[0]
+                getattr(self, f'{operation}_op')()
+                done += 1
+        finally:
+            connections.close_all()  # Release this thread's database connections (in-process mode)
+
+    def token_op(self):
+        status, body = self.call('token', 'POST', '/api/token/', {
+            'username': self.scenario.username, 'password': self.scenario.password,
+        })
+        if status == 200:
+            self.token = json.loads(body)['access']
+
+    def list_courses_op(self):
+        self.call('list_courses', 'GET', COURSES_URL)
+
+    def list_courses_with_intakes_op(self):
+        self.call('list_courses_with_intakes', 'GET', f'{COURSES_URL}?with_intakes=true')
+
+    def retrieve_course_op(self):
+        if not self.course_ids:
+            return self.list_courses_op()
+        self.call('retrieve_course', 'GET', f'{COURSES_URL}{self.random.choice(self.course_ids)}/')
+
+    def create_course_op(self):
+        status, body = self.call('create_course', 'POST', f'{COURSES_URL}create/', {'name': f'loadtest-{uuid.uuid4().hex[:12]}'})
+        if status == 201:
+            self.created_ids.append(json.loads(body)['id'])
+
+    def update_course_op(self):
+        if not self.created_ids:
+            return self.create_course_op()
+        course_id = self.random.choice(self.created_ids)
+        self.call('update_course', 'PUT', f'{COURSES_URL}{course_id}/update/', {'name': f'loadtest-{uuid.uuid4().hex[:12]}'})
+
+    def delete_course_op(self):
+        if not self.created_ids:
+            return self.create_course_op()
+        course_id = self.created_ids.pop()
+        self.created_intakes = [intake for intake in self.created_intakes if intake[0] != course_id]
+        self.call('delete_course', 'DELETE', f'{COURSES_URL}{course_id}/delete/')
+
+    def intake_dates(self):
+        start = date(2030, 1, 1) + timedelta(days=self.random.randrange(3650))
+        return {'start_date': start.isoformat(), 'end_date': (start + timedelta(days=self.random.randrange(30, 365))).isoformat()}
+
+    def list_intakes_op(self):
+        courses = self.course_ids + self.created_ids
+        if not courses:
+            return self.create_course_op()
+        self.call('list_intakes', 'GET', f'{COURSES_URL}{self.random.choice(courses)}/intakes/')
+
+    def retrieve_intake_op(self):
+        if not self.created_intakes:
+            return self.list_intakes_op()
+        course_id, intake_id = self.random.choice(self.created_intakes)
+        self.call('retrieve_intake', 'GET', f'{COURSES_URL}{course_id}/intakes/{intake_id}/')
+
+    def create_intake_op(self):
+        courses = self.course_ids + self.created_ids
+        if not courses:
+            return self.create_course_op()
+        course_id = self.random.choice(courses)
+        status, body = self.call('create_intake', 'POST', f'{COURSES_URL}{course_id}/intakes/create/', self.intake_dates())
+        if status == 201:
+            self.created_intakes.append((course_id, json.loads(body)['id']))
+
+    def update_intake_op(self):
+        if not self.created_intakes:
+            return self.create_intake_op()
+        course_id, intake_id = self.random.choice(self.created_intakes)
+        self.call('update_intake', 'PUT', f'{COURSES_URL}{course_id}/intakes/{intake_id}/update/', self.intake_dates())
+
+    def delete_intake_op(self):
+        if not self.created_intakes:
+            return self.create_intake_op()
+        course_id, intake_id = self.created_intakes.pop()
+        self.call('delete_intake', 'DELETE', f'{COURSES_URL}{course_id}/intakes/{intake_id}/delete/')
+
+
+def run_load_test(scenario, seed=None):
+    """
+    Run the scenario and return the report as a dict.
+    Uses HTTP when `scenario.url` is set and the in-process handler otherwise.
+    """
+    scenario.validate()
+
+    def make_transport():
+        return HttpTransport(scenario.url) if scenario.url else InProcessTransport()
+
+    # Seed the pool of course ids to retrieve from the first page of courses
+    setup = VirtualClient(make_transport(), scenario, Stats(), [])
+    setup.token_op()
+    course_ids = []
+    status, body = setup.transport.request('GET', f'{COURSES_URL}?page_size=100', token=setup.token)
+    if status == 200:
+        course_ids = [course['id'] for course in json.loads(body)['results']]
+
+    stats = Stats()
+    clients = [
+        VirtualClient(make_transport(), scenario, stats, course_ids, seed=None if seed is None else seed + i)
+        for i in range(scenario.clients)
+    ]
+    start = time.monotonic()
+    deadline = start + scenario.duration
+    threads = [threading.Thread(target=client.run, args=(deadline,), daemon=True) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = stats.report(time.monotonic() - start)
+    report['leftover_courses'] = sum(len(client.created_ids) for client in clients)
+    report['leftover_intakes'] = sum(len(client.created_intakes) for client in clients)
+    return report
@@ -0,0 +1,170 @@
+"""
+Structured JSON logging that keeps I/O off the request thread.
+
+`BackgroundHandler` only puts records on a bounded in-memory queue; a writer
+thread formats them with `JsonFormatter` and writes them to a file (or stderr)
+in batches. When the queue is full, records below WARNING are dropped and
+warnings or errors evict the oldest queued record, so bursts of access logs never
+block requests or grow memory. The writer reports how many records were dropped.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+
+# Record attributes copied into the JSON output when set (see AccessLogMiddleware)
+STRUCTURED_FIELDS = ('method', 'path', 'view', 'status', 'latency_ms', 'queries', 'user_id')
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format a record as one JSON object per line.
+    """
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'status', None) is None and hasattr(record, 'status_code'):
+            record.status = record.status_code  # django.request records
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class BackgroundHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for a background writer thread that formats and writes them in batches.
+    Writes to `filename` (appending) or stderr.
+    """
+
+    def __init__(self, filename=None, queue_size=10000, batch_size=200, flush_interval=1.0, stream=None):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.filename = filename
+        self.stream = stream or sys.stderr  # Bound now, like logging.StreamHandler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.drop_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.writer = None
+        self.writer_pid = None
+
+    def prepare(self, record):
+        """
+        Merge the message arguments and render any traceback now, while they are still valid,
+        but leave the JSON formatting to the writer thread.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self.writer_pid != os.getpid():  # First record, or a forked worker process
+            self.start()
+        super().emit(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        with self.drop_lock:
+            self.dropped += 1
+        if record.levelno >= logging.WARNING:
+            try:
+                self.queue.get_nowait()  # Make room by evicting the oldest record
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def start(self):
+        with self.lock:
+            if self.writer_pid == os.getpid():
+                return
+            self.writer_pid = os.getpid()
+            self.stopping.clear()
+            self.writer = threading.Thread(target=self.run, name='log-writer', daemon=True)
+            self.writer.start()
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.write_batch(self.next_batch(timeout=self.flush_interval))
+        self.flush_pending()
+
+    def next_batch(self, timeout):
+        """
+        Wait up to `timeout` seconds for a first record, then take whatever else is queued, up to batch_size.
+        """
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write_batch(self, batch):
+        with self.drop_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            batch.append(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f"Dropped {dropped} log records, the log queue was full",
+            }))
+        if not batch:
+            return
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        try:
+            if self.filename:
+                with open(self.filename, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+            else:
+                self.stream.write('\n'.join(lines) + '\n')
+                self.stream.flush()
+        except OSError:
+            pass  # Losing log lines is preferable to crashing the writer
+
+    def flush_pending(self):
+        while True:
+            batch = self.next_batch(timeout=0)
+            if not batch:
+                break
+            self.write_batch(batch)
+        self.write_batch([])  # Report any last drops
+
+    def close(self):
+        """
+        Stop the writer and write out what is still queued (called by logging.shutdown at exit).
+        """
+        self.stopping.set()
+        if self.writer is not None and self.writer_pid == os.getpid():
+            self.writer.join(timeout=5)
+        else:
+            self.flush_pending()
+        super().close()
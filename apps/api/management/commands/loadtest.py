@@ -0,0 +1,48 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from apps.api.loadtest import Scenario, run_load_test
+
+
+class Command(BaseCommand):
+    """
+    Drive the API with concurrent clients and report throughput and latency.
+    Without --url the requests run in-process against the configured database.
+    """
+    help = "Run a concurrent load test against the API, in-process or over HTTP."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', help="JSON scenario file (keys match the Scenario fields).")
+        parser.add_argument('--url', help="Base URL of a live server, e.g. http://localhost:8000.")
+        parser.add_argument('--username', help="User to obtain tokens for.")
+        parser.add_argument('--password', help="Password of that user.")
+        parser.add_argument('--clients', type=int, help="Number of concurrent clients.")
+        parser.add_argument('--duration', type=float, help="Run time in seconds.")
+        parser.add_argument('--requests', type=int, dest='requests_per_client', help="Stop each client after this many requests.")
+        parser.add_argument('--seed', type=int, help="Seed for reproducible operation sequences.")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            scenario = Scenario.from_file(options['scenario']) if options['scenario'] else Scenario()
+            for name in ('url', 'username', 'password', 'clients', 'duration', 'requests_per_client'):
+                if options[name] is not None:
+                    setattr(scenario, name, options[name])
+            report = run_load_test(scenario, seed=options['seed'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{'operation':<28}{'reqs':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err %':>8}{'locked':>8}")
+        rows = list(report['operations'].items()) + [('TOTAL', report['total'])]
+        for name, row in rows:
+            self.stdout.write(
+                f"{name:<28}{row['requests']:>8}{row['throughput_rps']:>10}{row['p50_ms']:>10}"
+                f"{row['p95_ms']:>10}{row['p99_ms']:>10}{row['error_rate'] * 100:>8.1f}{row['lock_errors']:>8}"
+            )
+        if report['leftover_courses']:
+            self.stdout.write(f"{report['leftover_courses']} courses created by the run were not deleted.")
+        if report['leftover_intakes']:
+            self.stdout.write(f"{report['leftover_intakes']} intakes created by the run were not deleted.")
@@ -0,0 +1,46 @@
+import threading
+from django.core.management.base import BaseCommand
+from django.db import connections
+from apps.api.jobs import work
+
+
+class Command(BaseCommand):
+    """
+    Run background workers for queued bulk catalog jobs.
+    Jobs live in the database, so no external broker is needed.
+    """
+    help = "Process queued bulk catalog jobs with a pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Number of worker threads.")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def worker():
+            try:
+                work(stop_event, poll_interval=options['poll_interval'], once=options['once'])
+            finally:
+                connections.close_all()
+
+        if options['workers'] <= 1:
+            try:
+                work(stop_event, poll_interval=options['poll_interval'], once=options['once'])
+            except KeyboardInterrupt:
+                pass
+            return
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"Started {len(threads)} job workers.")
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            stop_event.set()  # Workers finish their current job, then exit
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,241 @@
+import cProfile
+import io
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+API_PREFIX = '/api/'
+ADMIN_PREFIX = '/admin/'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+TOP_FUNCTIONS = 40
+
+access_logger = logging.getLogger('apps.api.access')
+
+
+class ProfilingMiddleware:
+    """
+    Run API requests under cProfile on demand.
+
+    Staff users trigger it with an `X-Profile: 1` header or a `?profile=1` query
+    parameter. With settings.API_PROFILE_SAMPLE_RATE = N > 0, 1 in N API requests
+    is also profiled automatically. Each profile writes a pstats dump and a text
+    report (top functions and the SQL executed) to settings.API_PROFILE_DIR, keeping
+    the newest settings.API_PROFILE_KEEP reports. Unprofiled requests only pay
+    for a header and query string lookup.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(API_PREFIX) or not self.should_profile(request):
+            return self.get_response(request)
+        return self.profile(request)
+
+    def should_profile(self, request):
+        sample_rate = settings.API_PROFILE_SAMPLE_RATE
+        if sample_rate and random.randrange(sample_rate) == 0:
+            return True
+        if request.META.get(PROFILE_HEADER) == '1' or request.GET.get(PROFILE_PARAM) == '1':
+            return self.is_staff(request)
+        return False
+
+    @staticmethod
+    def is_staff(request):
+        # API requests authenticate with JWT inside the view, so resolve the token here
+        if request.user.is_authenticated:
+            return request.user.is_staff
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return bool(result) and result[0].is_staff
+
+    def profile(self, request):
+        queries = []
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries.append((time.perf_counter() - start, sql, params))
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiler is already active in this thread
+            return self.get_response(request)
+        try:
+            with connection.execute_wrapper(record_query):
+                response = self.get_response(request)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        name = self.save(request, response, profiler, queries, elapsed)
+        response['X-Profile-Id'] = name
+        return response
+
+    def save(self, request, response, profiler, queries, elapsed):
+        directory = Path(settings.API_PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^a-zA-Z0-9]+', '-', request.path).strip('-')[:80]
+        name = f"{timezone.now():%Y%m%dT%H%M%S%f}-{request.method}-{slug}"
+
+        profiler.dump_stats(directory / f'{name}.prof')
+
+        report = io.StringIO()
+        report.write(f"{request.method} {request.get_full_path()} -> {response.status_code} in {elapsed * 1000:.1f} ms\n")
+        report.write(f"{len(queries)} queries, {sum(q[0] for q in queries) * 1000:.1f} ms in SQL\n\n")
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        report.write("\nSQL\n")
+        for duration, sql, params in queries:
+            report.write(f"{duration * 1000:8.2f} ms  {sql}  {params!r}\n")
+        (directory / f'{name}.txt').write_text(report.getvalue())
+
+        self.rotate(directory)
+        return name
+
+    @staticmethod
+    def rotate(directory):
+        reports = sorted(directory.glob('*.txt'))
+        for old in reports[:max(0, len(reports) - settings.API_PROFILE_KEEP)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix('.prof').unlink(missing_ok=True)
+
+
+class ConcurrencyBudget:
+    """
+    Cap on in-flight requests with a short, bounded wait queue.
+    """
+
+    def __init__(self, limit, queue_size, timeout):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Take a slot, waiting up to `timeout` seconds if the queue has room.
+        Returns False when the request should be shed.
+        """
+        with self.condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue_size:
+                return False
+            self.waiting += 1
+            try:
+                if not self.condition.wait_for(lambda: self.active < self.limit, timeout=self.timeout):
+                    return False
+                self.active += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+
+class LoadSheddingMiddleware:
+    """
+    Cap in-flight requests per worker process, with separate budgets for API reads,
+    API writes and the admin (settings.API_CONCURRENCY_LIMITS). Requests over budget
+    wait briefly in a bounded queue, then get a fast 503 with Retry-After.
+    The health check is answered here, before authentication or any database access.
+    Keep this middleware first in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.health_path = reverse('api:health_check')
+        self.budgets = {
+            name: ConcurrencyBudget(limit, queue_size, settings.API_QUEUE_TIMEOUT)
+            for name, (limit, queue_size) in settings.API_CONCURRENCY_LIMITS.items()
+        }
+
+    def budget_for(self, request):
+        if request.path.startswith(ADMIN_PREFIX):
+            return self.budgets.get('admin')
+        if request.path.startswith(API_PREFIX):
+            return self.budgets.get('read' if request.method in SAFE_METHODS else 'write')
+        return None
+
+    def __call__(self, request):
+        if request.path == self.health_path:
+            return JsonResponse({"status": "OK"})
+
+        budget = self.budget_for(request)
+        if budget is None:
+            return self.get_response(request)
+        if not budget.acquire():
+            response = JsonResponse({"detail": "Server is overloaded, please retry later."}, status=503)
+            response['Retry-After'] = str(settings.API_RETRY_AFTER)
+            return response
+        try:
+            return self.get_response(request)
+        finally:
+            budget.release()
+
+
+class AccessLogMiddleware:
+    """
+    Log one structured record per request to the 'apps.api.access' logger, with the
+    view name, status, latency and number of SQL queries (ERROR for 5xx responses).
+    Records are handed to a queue (see apps.api.logs), so no file I/O happens here.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        match = request.resolver_match
+        user = getattr(request, 'user', None)
+        access_logger.log(
+            logging.ERROR if response.status_code >= 500 else logging.INFO,
+            "%s %s %s", request.method, request.path, response.status_code,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'latency_ms': latency_ms,
+                'queries': queries,
+                'user_id': user.pk if user is not None and user.is_authenticated else None,
+            },
+        )
+        return response
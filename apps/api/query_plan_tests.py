@@ -0,0 +1,93 @@
+import re
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+from apps.admission.models import ArchivedIntake, Course, Intake
+
+# A "SCAN <table>" step reads the whole table (or a whole index), a "SEARCH" step uses an index lookup
+FULL_SCAN = re.compile(r'^SCAN (admission_\w+)')
+
+
+@skipUnless(connection.vendor == 'sqlite', "Query plans are checked against SQLite")
+class TestQueryPlans(APITestCase):
+    """
+    Capture EXPLAIN QUERY PLAN for every catalog query a view issues and fail
+    if any of them scans a whole admission table, unless the view pages through
+    that table by design.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(username='admin', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.course = Course.objects.create(name='Test Course')
+        Course.objects.create(name='Other Course')
+        self.intake = Intake.objects.create(course=self.course, start_date='2023-01-01', end_date='2023-12-31')
+        Intake.objects.create(course=self.course, start_date='2024-01-01', end_date='2024-12-31')
+        ArchivedIntake.objects.create(id=1000, course=self.course, start_date='2020-01-01', end_date='2020-12-31')
+
+    def full_scans(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, response.content)
+
+        scans = set()
+        for query in context.captured_queries:
+            sql = query['sql']
+            if 'admission_' not in sql or not sql.startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for row in cursor.fetchall():
+                    match = FULL_SCAN.match(row[-1])
+                    if match:
+                        scans.add((match.group(1), sql))
+        return scans
+
+    def assert_no_full_scans(self, method, url, data=None, allowed=()):
+        scans = {(table, sql) for table, sql in self.full_scans(method, url, data) if table not in allowed}
+        self.assertFalse(scans, f"{method.upper()} {url} scans whole tables: {sorted(scans)}")
+
+    def test_list_courses(self):
+        # Listing every course pages through the course table in primary key order
+        allowed = {'admission_course'}
+        self.assert_no_full_scans('get', '/api/admission/courses/', allowed=allowed)
+        self.assert_no_full_scans('get', '/api/admission/courses/?with_intakes=true&include_archived=true', allowed=allowed)
+        self.assert_no_full_scans('get', '/api/admission/courses/?with_intakes=true&format=columnar', allowed=allowed)
+        self.assert_no_full_scans('get', '/api/admission/courses/?with_intakes=true&intakes_limit=1', allowed=allowed)
+        self.assert_no_full_scans('get', '/api/admission/courses/?with_intakes=true&intakes_limit=1&format=columnar', allowed=allowed)
+
+    def test_course_detail_views(self):
+        self.assert_no_full_scans('get', f'/api/admission/courses/{self.course.id}/?include_archived=true')
+        self.assert_no_full_scans('get', f'/api/admission/courses/{self.course.id}/?intakes_limit=1')
+        self.assert_no_full_scans('put', f'/api/admission/courses/{self.course.id}/update/', {'name': 'Renamed'})
+        self.assert_no_full_scans('delete', f'/api/admission/courses/{self.course.id}/delete/')
+
+    def test_intake_views(self):
+        base = f'/api/admission/courses/{self.course.id}/intakes/'
+        self.assert_no_full_scans('get', base)
+        self.assert_no_full_scans('get', f'{base}?include_archived=true')
+        self.assert_no_full_scans('get', f'{base}?format=columnar')
+        self.assert_no_full_scans('post', f'{base}create/', {'start_date': '2025-01-01', 'end_date': '2025-12-31'})
+        self.assert_no_full_scans('get', f'{base}{self.intake.id}/')
+        self.assert_no_full_scans('put', f'{base}{self.intake.id}/update/', {'start_date': '2023-02-01', 'end_date': '2023-11-30'})
+        self.assert_no_full_scans('delete', f'{base}{self.intake.id}/delete/')
+
+    def test_intake_calendar(self):
+        self.assert_no_full_scans('get', '/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31')
+        self.assert_no_full_scans('get', '/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31&group_by=course')
+
+    def test_change_feed(self):
+        self.assert_no_full_scans('get', '/api/admission/changes/?limit=2')
+
+    def test_detects_full_scans(self):
+        """
+        Guard against the check silently passing: an unindexed filter must be reported.
+        """
+        with CaptureQueriesContext(connection) as context:
+            list(Course.objects.filter(name__contains='Test'))
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {context.captured_queries[0]['sql']}")
+            self.assertTrue(any(FULL_SCAN.match(row[-1]) for row in cursor.fetchall()))
@@ -0,0 +1,28 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+class ColumnarRenderer(JSONRenderer):
+    """
+    Opt-in renderer for bulk consumers, selected with `?format=columnar` or
+    `Accept: application/vnd.admission.columnar+json`.
+    Views supporting it return parallel column arrays instead of a list of objects.
+    """
+    media_type = 'application/vnd.admission.columnar+json'
+    format = 'columnar'
+
+
+# Renderers for list views that support the columnar format
+COLUMNAR_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarRenderer]
+
+
+def wants_columnar(request):
+    return request.accepted_renderer.format == ColumnarRenderer.format
+
+
+def to_columns(rows, fields):
+    """
+    Turn `values_list` tuples into a dict of parallel column lists.
+    """
+    rows = list(rows)
+    return {field: [row[i] for row in rows] for i, field in enumerate(fields)}
@@ -1,5 +1,6 @@
+from django.urls import reverse
 from rest_framework import serializers
-from apps.admission.models import Course, Intake
+from apps.admission.models import CatalogJob, Course, Intake
 
 class IntakeSerializer(serializers.ModelSerializer):
     """
@@ -12,6 +13,16 @@ class IntakeSerializer(serializers.ModelSerializer):
         model = Intake
         fields = ['id', 'start_date', 'end_date']
 
+    def validate(self, attrs):
+        """
+        Mirror the database check constraint so invalid ranges return 400 instead of failing on save.
+        """
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': 'End date cannot be earlier than start date.'})
+        return attrs
+
 class CourseSerializer(serializers.ModelSerializer):
     """
     Serializer for the Course model.
@@ -36,9 +47,25 @@ class CourseSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
         # Allow the option to exclude 'intakes' field if it's not needed
         exclude_intakes = kwargs.pop('exclude_intakes', False)  # Get the flag from the view
+        # Allow the option to list archived intakes alongside current ones
+        include_archived = kwargs.pop('include_archived', False)
+        # Allow the option to embed only the intakes prefetched into `bounded_intakes`,
+        # with their total count and a link to the full list
+        bounded_intakes = kwargs.pop('bounded_intakes', False)
         super().__init__(*args, **kwargs)
         if exclude_intakes:
             self.fields.pop('intakes')  # Exclude intakes field if the flag is true
+        elif bounded_intakes:
+            self.fields['intakes'] = IntakeSerializer(many=True, read_only=True, source='bounded_intakes')
+            self.fields['intakes_count'] = serializers.IntegerField(read_only=True)
+            self.fields['intakes_url'] = serializers.SerializerMethodField()
+        elif include_archived:
+            self.fields['intakes'] = IntakeSerializer(many=True, read_only=True, source='intakes_with_archive')
+
+    def get_intakes_url(self, obj):
+        url = reverse('api:list_intakes', kwargs={'course_id': obj.id})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
     def create(self, validated_data):
         """
@@ -58,3 +85,18 @@ class CourseSerializer(serializers.ModelSerializer):
         instance.name = validated_data.get('name', instance.name)
         instance.save()
         return instance
+
+
+class CatalogJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer reporting the status and progress of a bulk catalog job.
+    The submitted payload is not echoed back.
+    """
+
+    class Meta:
+        model = CatalogJob
+        fields = [
+            'id', 'kind', 'status', 'total', 'processed', 'succeeded', 'failed',
+            'errors', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,101 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.admission.models import ArchivedIntake, Course, Intake
+from apps.admission.signals import intakes_bulk_deleted
+
+INTAKE_CALENDAR_VERSION_KEY = 'intake_calendar:version'
+
+
+def bump_intake_calendar_version():
+    cache.set(INTAKE_CALENDAR_VERSION_KEY, time.time_ns(), None)
+
+
+@receiver(pre_save, sender=Intake)
+def remember_stored_start_date(sender, instance, raw=False, **kwargs):
+    """
+    Keep the start date stored before this save, so moving an intake out of a closed period also invalidates it.
+    """
+    if instance.pk is not None and not raw:
+        instance._stored_start_date = (
+            Intake.objects.filter(pk=instance.pk).values_list('start_date', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Intake)
+@receiver(post_delete, sender=Intake)
+@receiver(post_delete, sender=ArchivedIntake)
+def invalidate_intake_calendar(sender, instance, **kwargs):
+    """
+    Invalidate cached calendar counts when an intake starting in the past changes,
+    or an intake is moved out of the past.
+    Bumping the version key orphans every cached entry without enumerating them.
+    """
+    # start_date may still be an ISO string when assigned directly, so compare as ISO strings
+    today = str(timezone.localdate())
+    start_dates = [instance.start_date, getattr(instance, '_stored_start_date', None)]
+    if any(start_date and str(start_date) < today for start_date in start_dates):
+        bump_intake_calendar_version()
+
+
+@receiver(intakes_bulk_deleted)
+def invalidate_intake_calendar_bulk(sender, start_dates, archived=False, **kwargs):
+    if archived:
+        return  # The calendar counts archived intakes too
+    today = timezone.localdate()
+    if any(start_date < today for start_date in start_dates):
+        bump_intake_calendar_version()
+
+
+def detail_version_key(model_name, object_id):
+    return f'detail:{model_name}:{object_id}:version'
+
+
+def bump_detail_versions(model_name, object_ids):
+    """
+    Orphan the cached detail responses of the given objects (see apps.api.caching).
+    Bumped now and again on commit, so a request racing the transaction cannot
+    cache the old row under the new version.
+    """
+    keys = [detail_version_key(model_name, object_id) for object_id in object_ids]
+
+    def bump():
+        version = time.time_ns()
+        cache.set_many({key: version for key in keys}, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_detail(sender, instance, **kwargs):
+    """
+    Cached intake details depend on their course's version, so one bump also covers
+    a course's intakes disappearing when it is queued for asynchronous deletion, or
+    reappearing when a failed deletion job restores it.
+    """
+    bump_detail_versions('course', [instance.id])
+    if instance.deleting or 'deleting' in (kwargs.get('update_fields') or ()):
+        bump_intake_calendar_version()
+
+
+@receiver(post_save, sender=Intake)
+@receiver(post_delete, sender=Intake)
+@receiver(post_save, sender=ArchivedIntake)
+@receiver(post_delete, sender=ArchivedIntake)
+def invalidate_intake_detail(sender, instance, **kwargs):
+    """
+    Course details embed their current and archived intakes, so both the intake and its course are invalidated.
+    """
+    if sender is Intake:
+        bump_detail_versions('intake', [instance.id])
+    bump_detail_versions('course', [instance.course_id])
+
+
+@receiver(intakes_bulk_deleted)
+def invalidate_intake_detail_bulk(sender, course_id, intake_ids, **kwargs):
+    bump_detail_versions('course', [course_id])  # Also orphans the intakes' cached details
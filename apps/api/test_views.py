@@ -1,8 +1,32 @@
-from rest_framework.test import APITestCase, APIClient
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import patch
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TransactionTestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
 from rest_framework import status
 from django.contrib.auth.models import User, Permission
-from apps.admission.models import Course, Intake
+from apps.admission.models import ArchivedIntake, CatalogChange, CatalogJob, Course, Intake
 from rest_framework_simplejwt.tokens import RefreshToken
+from apps.admission.typeahead import course_index
+from . import jobs
+from .coalescing import SingleFlight, request_key
+from .logs import BackgroundHandler, JsonFormatter
+from .loadtest import Scenario, run_load_test
+from .middleware import ConcurrencyBudget
 
 class TestListCourses(APITestCase):
     def setUp(self):
@@ -232,4 +256,808 @@ class TestDeleteIntake(APITestCase):
     def test_delete_non_existent_intake(self):
         self.user.user_permissions.add(Permission.objects.get(codename='delete_intake'))
         response = self.client.delete(f'/api/admission/courses/{self.course.id}/intakes/999/delete/')
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class TestChangeFeed(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.course = Course.objects.create(name='Test Course')
+        self.intake = Intake.objects.create(course=self.course, start_date='2023-01-01', end_date='2023-12-31')
+        self.client.force_authenticate(user=self.user)
+
+    def grant_view_permissions(self):
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='view_course'),
+            Permission.objects.get(codename='view_intake'),
+        )
+
+    def test_change_feed_no_permission(self):
+        response = self.client.get('/api/admission/changes/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_change_feed_full_sync(self):
+        self.grant_view_permissions()
+        response = self.client.get('/api/admission/changes/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['has_more'])
+        self.assertEqual([(r['type'], r['id']) for r in response.data['results']],
+                         [('course', self.course.id), ('intake', self.intake.id)])
+
+    def test_change_feed_since_cursor_returns_tombstones(self):
+        self.grant_view_permissions()
+        cursor = self.client.get('/api/admission/changes/').data['next_cursor']
+        self.course.delete()  # Cascades to the intake
+
+        response = self.client.get(f'/api/admission/changes/?since={cursor}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertTrue(all(r['deleted'] and r['data'] is None for r in response.data['results']))
+
+    def test_change_feed_pagination(self):
+        self.grant_view_permissions()
+        response = self.client.get('/api/admission/changes/?limit=1')
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(response.data['results'][0]['type'], 'course')
+
+        response = self.client.get(f"/api/admission/changes/?limit=1&since={response.data['next_cursor']}")
+        self.assertFalse(response.data['has_more'])
+        self.assertEqual(response.data['results'][0]['type'], 'intake')
+
+    def test_change_feed_pages_through_entries_older_than_retention(self):
+        self.grant_view_permissions()
+        Course.objects.create(name='Second Course')
+        old = timezone.now() - settings.CATALOG_TOMBSTONE_RETENTION * 2
+        CatalogChange.objects.update(changed_at=old)
+
+        seen = []
+        url = '/api/admission/changes/?limit=1'
+        while True:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend((r['type'], r['id']) for r in response.data['results'])
+            if not response.data['has_more']:
+                break
+            url = f"/api/admission/changes/?limit=1&since={response.data['next_cursor']}"
+        self.assertEqual(len(seen), 3)
+
+    def test_change_feed_expired_cursor(self):
+        self.grant_view_permissions()
+        response = self.client.get('/api/admission/changes/?since=1-0')
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_change_feed_invalid_cursor(self):
+        self.grant_view_permissions()
+        response = self.client.get('/api/admission/changes/?since=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/admission/changes/?since=1-99999999999999999')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestIntakeCalendar(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.course = Course.objects.create(name='Test Course')
+        self.other_course = Course.objects.create(name='Other Course')
+        Intake.objects.create(course=self.course, start_date='2023-01-05', end_date='2023-06-30')
+        Intake.objects.create(course=self.course, start_date='2023-01-20', end_date='2023-06-30')
+        Intake.objects.create(course=self.other_course, start_date='2023-03-01', end_date='2023-09-30')
+        self.client.force_authenticate(user=self.user)
+        cache.clear()
+
+    def test_intake_calendar_no_permission(self):
+        response = self.client.get('/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_intake_calendar_by_month(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_intake'))
+        response = self.client.get('/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31&bucket=month')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'period': '2023-01-01', 'count': 2},
+            {'period': '2023-03-01', 'count': 1},
+        ])
+
+    def test_intake_calendar_grouped_by_course(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_intake'))
+        response = self.client.get('/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31&group_by=course')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'period': '2023-01-01', 'course_id': self.course.id, 'count': 2},
+            {'period': '2023-03-01', 'course_id': self.other_course.id, 'count': 1},
+        ])
+
+    def test_intake_calendar_closed_period_is_cached(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_intake'))
+        url = '/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31&bucket=week'
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(sum(row['count'] for row in response.data['results']), 3)
+
+        # Changing a past intake invalidates the cached counts
+        Intake.objects.create(course=self.course, start_date='2023-02-01', end_date='2023-06-30')
+        response = self.client.get(url)
+        self.assertEqual(sum(row['count'] for row in response.data['results']), 4)
+
+        # So does moving a past intake into the future
+        intake = Intake.objects.get(start_date='2023-02-01')
+        intake.start_date, intake.end_date = '2099-02-01', '2099-06-30'
+        intake.save()
+        response = self.client.get(url)
+        self.assertEqual(sum(row['count'] for row in response.data['results']), 3)
+
+    def test_intake_calendar_invalid_parameters(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_intake'))
+        response = self.client.get('/api/admission/intakes/calendar/?start=2023-12-31&end=2023-01-01')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31&bucket=year')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestIncludeArchived(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.course = Course.objects.create(name='Test Course')
+        self.intake = Intake.objects.create(course=self.course, start_date='2099-01-01', end_date='2099-12-31')
+        self.archived = ArchivedIntake.objects.create(id=self.intake.id + 1, course=self.course, start_date='2020-01-01', end_date='2020-12-31')
+        self.client.force_authenticate(user=self.user)
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='view_course'),
+            Permission.objects.get(codename='view_intake'),
+        )
+
+    def test_list_intakes_excludes_archived_by_default(self):
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/intakes/')
+        self.assertEqual([i['id'] for i in response.data['results']], [self.intake.id])
+
+    def test_list_intakes_include_archived(self):
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/intakes/?include_archived=true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([i['id'] for i in response.data['results']], [self.intake.id, self.archived.id])
+
+    def test_list_courses_with_intakes_include_archived(self):
+        response = self.client.get('/api/admission/courses/?with_intakes=true&include_archived=true')
+        self.assertEqual([i['id'] for i in response.data['results'][0]['intakes']], [self.intake.id, self.archived.id])
+
+    def test_retrieve_course_include_archived(self):
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/')
+        self.assertEqual(len(response.data['intakes']), 1)
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/?include_archived=true')
+        self.assertEqual(len(response.data['intakes']), 2)
+
+    def test_intake_calendar_counts_archived(self):
+        response = self.client.get('/api/admission/intakes/calendar/?start=2020-01-01&end=2099-12-31&bucket=month')
+        self.assertEqual(sum(row['count'] for row in response.data['results']), 2)
+
+
+class TestLoadTestHarness(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='loaduser', password='loadpassword')
+        self.user.user_permissions.add(*Permission.objects.filter(codename__in=[
+            'view_course', 'add_course', 'change_course', 'delete_course',
+            'view_intake', 'add_intake', 'change_intake', 'delete_intake',
+        ]))
+        Course.objects.create(name='Test Course')
+
+    def test_in_process_load_test_report(self):
+        scenario = Scenario(username='loaduser', password='loadpassword', clients=1, duration=30, requests_per_client=20)
+        report = run_load_test(scenario, seed=1)
+        self.assertEqual(report['total']['requests'], 21)  # Initial token plus 20 mixed requests
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertGreater(report['total']['p99_ms'], 0)
+        self.assertEqual(report['total']['lock_errors'], 0)
+
+    def test_intake_operations(self):
+        mix = {'create_intake': 2, 'list_intakes': 1, 'retrieve_intake': 1, 'update_intake': 1, 'delete_intake': 1}
+        scenario = Scenario(username='loaduser', password='loadpassword', clients=1, duration=30, requests_per_client=30, mix=mix)
+        report = run_load_test(scenario, seed=3)
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertEqual(set(report['operations']), {'token', *mix})
+        self.assertEqual(Intake.objects.count(), report['leftover_intakes'])
+
+    def test_scenario_rejects_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            Scenario(mix={'drop_tables': 1}).validate()
+
+
+class TestBulkJobs(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.course = Course.objects.create(name='Test Course')
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_intakes_no_permission(self):
+        data = {'intakes': [{'course_id': self.course.id, 'start_date': '2024-01-01', 'end_date': '2024-06-30'}]}
+        response = self.client.post('/api/admission/intakes/bulk/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_intakes_job_lifecycle(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_intake'))
+        data = {'intakes': [
+            {'course_id': self.course.id, 'start_date': '2024-01-01', 'end_date': '2024-06-30'},
+            {'course_id': self.course.id, 'start_date': '2024-07-01', 'end_date': '2024-12-31'},
+            {'course_id': 999, 'start_date': '2024-07-01', 'end_date': '2024-12-31'},
+        ]}
+        response = self.client.post('/api/admission/intakes/bulk/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertEqual(Intake.objects.count(), 0)  # Nothing is written on the request path
+
+        call_command('run_jobs', '--workers', '1', '--once')
+
+        response = self.client.get(response['Location'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'succeeded')
+        self.assertEqual((response.data['processed'], response.data['succeeded'], response.data['failed']), (3, 2, 1))
+        self.assertEqual(response.data['errors'][0]['index'], 2)
+        self.assertEqual(self.course.intakes.count(), 2)
+
+    def test_bulk_intakes_invalid_ids_are_item_errors(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_intake'), Permission.objects.get(codename='change_intake'))
+        data = {'intakes': [
+            {'course_id': self.course.id, 'start_date': '2024-01-01', 'end_date': '2024-06-30'},
+            {'id': 'abc', 'course_id': self.course.id, 'start_date': '2024-01-01', 'end_date': '2024-06-30'},
+            {'course_id': 'abc', 'start_date': '2024-01-01', 'end_date': '2024-06-30'},
+            {'course_id': self.course.id, 'start_date': '2024-07-01', 'end_date': '2024-12-31'},
+        ]}
+        response = self.client.post('/api/admission/intakes/bulk/', data, format='json')
+        call_command('run_jobs', '--workers', '1', '--once')
+
+        job = CatalogJob.objects.get(id=response.data['id'])
+        self.assertEqual(job.status, CatalogJob.SUCCEEDED)
+        self.assertEqual((job.processed, job.succeeded, job.failed), (4, 2, 2))
+        self.assertEqual([error['index'] for error in job.errors], [1, 2])
+        self.assertEqual(self.course.intakes.count(), 2)
+
+    def test_failed_chunk_is_not_counted(self):
+        def save_or_fail(item):
+            if item['name'] == 'Boom':
+                raise RuntimeError('Unexpected failure')
+            return jobs.save_course(item)
+
+        items = [{'name': 'First'}, {'name': 'Second'}, {'name': 'Boom'}]
+        job = CatalogJob.objects.create(kind='bulk_courses', payload=items, total=len(items))
+        with patch.dict(jobs.JOB_HANDLERS, {'bulk_courses': save_or_fail}), patch.object(jobs, 'JOB_CHUNK_SIZE', 2):
+            jobs.work(once=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CatalogJob.FAILED)
+        self.assertEqual((job.processed, job.succeeded, job.failed), (2, 2, 0))
+        self.assertEqual(job.errors, [{'index': 2, 'errors': {'detail': 'Unexpected failure'}}])
+        self.assertTrue(Course.objects.filter(name='Second').exists())
+
+    def test_stale_job_is_requeued_and_resumed(self):
+        items = [{'name': 'Done Before'}, {'name': 'Resumed'}]
+        stale = timezone.now() - timedelta(seconds=settings.CATALOG_JOB_STALE_TIMEOUT + 1)
+        job = CatalogJob.objects.create(
+            kind='bulk_courses', payload=items, total=len(items), status=CatalogJob.RUNNING,
+            processed=1, succeeded=1, attempts=1, started_at=stale, heartbeat_at=stale,
+        )
+        with patch.object(jobs, 'JOB_CHUNK_SIZE', 1):
+            jobs.work(once=True)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (CatalogJob.SUCCEEDED, 2))
+        self.assertEqual((job.processed, job.succeeded), (2, 2))
+        self.assertFalse(Course.objects.filter(name='Done Before').exists())  # Not applied twice
+        self.assertTrue(Course.objects.filter(name='Resumed').exists())
+
+    def test_failed_course_delete_shows_the_course_again(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='delete_course'))
+        with patch.object(jobs, 'delete_course', side_effect=RuntimeError('Unexpected failure')):
+            self.client.delete(f'/api/admission/courses/{self.course.id}/delete/?async=true')
+            self.assertFalse(Course.objects.filter(id=self.course.id).exists())
+            jobs.work(once=True)
+        self.assertTrue(Course.objects.filter(id=self.course.id).exists())
+
+    def test_abandoned_job_cannot_save_progress(self):
+        job = CatalogJob.objects.create(kind='bulk_courses', payload=[{'name': 'Late'}], total=1, attempts=1)
+        CatalogJob.objects.filter(id=job.id).update(attempts=2)  # Claimed again by another worker
+        jobs.run_job(job)
+        self.assertFalse(Course.objects.filter(name='Late').exists())
+
+    def test_bulk_courses_update_requires_change_permission(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_course'))
+        data = {'courses': [{'name': 'New Course'}, {'id': self.course.id, 'name': 'Renamed Course'}]}
+        response = self.client.post('/api/admission/courses/bulk/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.user_permissions.add(Permission.objects.get(codename='change_course'))
+        self.user = User.objects.get(id=self.user.id)  # Reset the permission cache
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post('/api/admission/courses/bulk/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        call_command('run_jobs', '--workers', '1', '--once')
+        self.assertEqual(sorted(Course.objects.values_list('name', flat=True)), ['New Course', 'Renamed Course'])
+
+    def test_bulk_invalid_payload(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_course'))
+        response = self.client.post('/api/admission/courses/bulk/', {'courses': 'not a list'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_job_of_other_user(self):
+        other = User.objects.create_user(username='otheruser', password='otherpassword')
+        job = CatalogJob.objects.create(kind='bulk_courses', payload=[], created_by=other)
+        response = self.client.get(f'/api/admission/jobs/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestCourseTypeahead(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.course = Course.objects.create(name='Intro to Python')
+        Course.objects.create(name='Java')
+        course_index.build()
+        self.client.force_authenticate(user=self.user)
+
+    def test_course_typeahead_no_permission(self):
+        response = self.client.get('/api/admission/courses/typeahead/?q=py')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_course_typeahead_with_permission(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_course'))
+        with self.assertNumQueries(2):  # User and group permission lookups only, no course query
+            response = self.client.get('/api/admission/courses/typeahead/?q=py')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': self.course.id, 'name': 'Intro to Python'}])
+
+
+class TestColumnarFormat(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='view_course'),
+            Permission.objects.get(codename='view_intake'),
+        )
+        self.course = Course.objects.create(name='Test Course')
+        self.other_course = Course.objects.create(name='Other Course')
+        self.intake = Intake.objects.create(course=self.other_course, start_date='2023-01-01', end_date='2023-12-31')
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_courses_columnar(self):
+        response = self.client.get('/api/admission/courses/?format=columnar')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.admission.columnar+json')
+        self.assertEqual(response.json()['results'], {
+            'id': [self.course.id, self.other_course.id],
+            'name': ['Test Course', 'Other Course'],
+        })
+
+    def test_list_courses_with_intakes_columnar(self):
+        response = self.client.get('/api/admission/courses/?with_intakes=true', HTTP_ACCEPT='application/vnd.admission.columnar+json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results']['intakes'], {
+            'course_index': [1],
+            'id': [self.intake.id],
+            'start_date': ['2023-01-01'],
+            'end_date': ['2023-12-31'],
+        })
+
+    def test_list_intakes_columnar(self):
+        response = self.client.get(f'/api/admission/courses/{self.other_course.id}/intakes/?format=columnar')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'], {
+            'id': [self.intake.id], 'start_date': ['2023-01-01'], 'end_date': ['2023-12-31'],
+        })
+
+    def test_list_courses_default_format_unchanged(self):
+        response = self.client.get('/api/admission/courses/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.data['results'][0], {'id': self.course.id, 'name': 'Test Course'})
+
+
+class TestIntakeDateValidation(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='add_intake'))
+        self.course = Course.objects.create(name='Test Course')
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_intake_end_before_start(self):
+        data = {'start_date': '2023-12-31', 'end_date': '2023-01-01'}
+        response = self.client.post(f'/api/admission/courses/{self.course.id}/intakes/create/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('end_date', response.data)
+
+
+class TestDeleteCourseAsync(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='delete_course'),
+            Permission.objects.get(codename='view_course'),
+        )
+        self.course = Course.objects.create(name='Test Course')
+        self.intake = Intake.objects.create(course=self.course, start_date='2023-01-01', end_date='2023-12-31')
+        self.client.force_authenticate(user=self.user)
+
+    def test_delete_course_async_hides_intakes(self):
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='view_intake'),
+            Permission.objects.get(codename='change_intake'),
+        )
+        intake_url = f'/api/admission/courses/{self.course.id}/intakes/{self.intake.id}/'
+        calendar_url = '/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31'
+        self.assertEqual(self.client.get(intake_url).status_code, status.HTTP_200_OK)  # Cached
+        self.assertEqual(self.client.get(calendar_url).data['results'][0]['count'], 1)  # Cached
+
+        self.client.delete(f'/api/admission/courses/{self.course.id}/delete/?async=true')
+        self.assertEqual(self.client.get(intake_url).status_code, status.HTTP_404_NOT_FOUND)
+        data = {'start_date': '2023-02-01', 'end_date': '2023-12-31'}
+        self.assertEqual(self.client.put(f'{intake_url}update/', data, format='json').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(calendar_url).data['results'], [])
+
+        self.user.user_permissions.add(Permission.objects.get(codename='view_course'))
+        results = self.client.get('/api/admission/changes/').data['results']
+        self.assertEqual(results, [])
+
+    def test_failed_delete_course_async_restores_the_calendar(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_intake'))
+        intake_url = f'/api/admission/courses/{self.course.id}/intakes/{self.intake.id}/'
+        calendar_url = '/api/admission/intakes/calendar/?start=2023-01-01&end=2023-12-31'
+        self.client.delete(f'/api/admission/courses/{self.course.id}/delete/?async=true')
+        self.assertEqual(self.client.get(calendar_url).data['results'], [])  # Cached
+        self.assertEqual(self.client.get(intake_url).status_code, status.HTTP_404_NOT_FOUND)
+
+        with patch.object(jobs, 'delete_course', side_effect=RuntimeError('Unexpected failure')):
+            jobs.work(once=True)
+        self.assertEqual(self.client.get(calendar_url).data['results'][0]['count'], 1)
+        self.assertEqual(self.client.get(intake_url).status_code, status.HTTP_200_OK)
+
+    def test_delete_course_async(self):
+        response = self.client.delete(f'/api/admission/courses/{self.course.id}/delete/?async=true')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        # Hidden right away, deleted by the worker
+        self.assertEqual(self.client.get(f'/api/admission/courses/{self.course.id}/').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get('/api/admission/courses/').data['count'], 0)
+        self.assertTrue(Course.all_objects.filter(id=self.course.id).exists())
+
+        call_command('run_jobs', '--workers', '1', '--once')
+        self.assertEqual(self.client.get(response['Location']).data['status'], 'succeeded')
+        self.assertFalse(Course.all_objects.filter(id=self.course.id).exists())
+        self.assertFalse(Intake.objects.exists())
+
+
+class TestProfilingMiddleware(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir)
+        self.staff = User.objects.create_user(username='staffuser', password='testpassword', is_staff=True)
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        Course.objects.create(name='Test Course')
+
+    def get_courses(self, user, **extra):
+        token = RefreshToken.for_user(user).access_token
+        with self.settings(API_PROFILE_DIR=self.profile_dir):
+            return self.client.get('/api/admission/courses/', HTTP_AUTHORIZATION=f'Bearer {token}', **extra)
+
+    def test_staff_request_is_profiled(self):
+        response = self.get_courses(self.staff, HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        name = response['X-Profile-Id']
+        self.assertTrue(os.path.exists(os.path.join(self.profile_dir, f'{name}.prof')))
+        with open(os.path.join(self.profile_dir, f'{name}.txt')) as report:
+            content = report.read()
+        self.assertIn('admission_course', content)  # SQL executed by the view
+        self.assertIn('cumulative', content)  # Top functions
+
+    def test_non_staff_request_is_not_profiled(self):
+        response = self.get_courses(self.user, HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_profiles_are_rotated(self):
+        with self.settings(API_PROFILE_SAMPLE_RATE=1, API_PROFILE_KEEP=2):
+            for _ in range(3):
+                self.get_courses(self.user)
+        self.assertEqual(len([f for f in os.listdir(self.profile_dir) if f.endswith('.txt')]), 2)
+
+
+class TestBoundedIntakes(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='view_course'))
+        self.course = Course.objects.create(name='Test Course')
+        self.other_course = Course.objects.create(name='Other Course')
+        self.past = Intake.objects.create(course=self.course, start_date='2020-01-01', end_date='2020-12-31')
+        self.upcoming = [
+            Intake.objects.create(course=self.course, start_date=f'{year}-01-01', end_date=f'{year}-12-31')
+            for year in (2099, 2098, 2097)
+        ]
+        Intake.objects.create(course=self.other_course, start_date='2099-01-01', end_date='2099-12-31')
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_courses_bounded_upcoming_intakes(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/admission/courses/?with_intakes=true&intakes_limit=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        course, other_course = response.data['results']
+        self.assertEqual([i['start_date'] for i in course['intakes']], ['2097-01-01', '2098-01-01'])
+        self.assertEqual(course['intakes_count'], 3)
+        self.assertTrue(course['intakes_url'].endswith(f'/api/admission/courses/{self.course.id}/intakes/'))
+        self.assertEqual(len(other_course['intakes']), 1)
+        self.assertTrue(any('ROW_NUMBER() OVER (PARTITION BY' in q['sql'] for q in context.captured_queries))
+
+    def test_retrieve_course_bounded_intakes_ordering(self):
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/?intakes_limit=1&intakes_order=start_date')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([i['id'] for i in response.data['intakes']], [self.past.id])
+        self.assertEqual(response.data['intakes_count'], 4)
+
+    def test_invalid_intakes_limit(self):
+        response = self.client.get('/api/admission/courses/?with_intakes=true&intakes_limit=0')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/?intakes_limit=5&intakes_order=random')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_courses_bounded_intakes_columnar(self):
+        response = self.client.get('/api/admission/courses/?with_intakes=true&intakes_limit=2&format=columnar')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        self.assertEqual(results['intakes_count'], [3, 1])
+        self.assertEqual(results['intakes']['course_index'], [0, 0, 1])
+        self.assertEqual(results['intakes']['start_date'], ['2097-01-01', '2098-01-01', '2099-01-01'])
+
+    def test_include_archived_with_intakes_limit_is_rejected(self):
+        response = self.client.get('/api/admission/courses/?with_intakes=true&intakes_limit=2&include_archived=true')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f'/api/admission/courses/{self.course.id}/?intakes_limit=2&include_archived=true')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestLoadShedding(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def test_health_check_skips_auth_and_database(self):
+        self.client.force_authenticate(user=None)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/health/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'OK'})
+
+    def test_requests_over_budget_are_shed(self):
+        with self.settings(API_CONCURRENCY_LIMITS={'read': (0, 0), 'write': (1, 0), 'admin': (1, 0)}):
+            client = APIClient()  # Middleware is instantiated with the overridden settings
+            client.force_authenticate(user=self.user)
+            response = client.get('/api/admission/courses/')
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(response['Retry-After'], '1')
+            self.assertEqual(client.get('/api/health/').status_code, status.HTTP_200_OK)
+
+    def test_concurrency_budget_queue(self):
+        budget = ConcurrencyBudget(limit=1, queue_size=1, timeout=5)
+        self.assertTrue(budget.acquire())
+
+        # A waiting request gets the slot once it is released
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(budget.acquire()))
+        waiter.start()
+        while budget.waiting == 0:
+            time.sleep(0.001)
+        self.assertFalse(budget.acquire())  # Queue full
+        budget.release()
+        waiter.join()
+        self.assertEqual(result, [True])
+
+        # The queue gives up after the timeout
+        budget.timeout = 0.01
+        self.assertFalse(budget.acquire())
+
+
+class TestRequestCoalescing(APITestCase):
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer', password='testpassword')
+        self.viewer.user_permissions.add(Permission.objects.get(codename='view_course'))
+        self.other = User.objects.create_user(username='other', password='testpassword')
+        self.lock_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.lock_dir, ignore_errors=True)
+
+    def key(self, user, query):
+        request = Request(APIRequestFactory().get(f'/api/admission/courses/1/{query}'))
+        request.user = user
+        return request_key(request, ('admission.view_course',))
+
+    def test_key_normalizes_params_and_separates_permission_scopes(self):
+        self.assertEqual(self.key(self.viewer, '?a=1&b=2'), self.key(self.viewer, '?b=2&a=1'))
+        self.assertNotEqual(self.key(self.viewer, '?a=1'), self.key(self.viewer, '?a=2'))
+        self.assertNotEqual(self.key(self.viewer, '?a=1'), self.key(self.other, '?a=1'))
+
+    def run_concurrently(self, flights, fn):
+        results = []
+        threads = [threading.Thread(target=lambda f=f: results.append(f.do('key', fn))) for f in flights]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_callers_share_one_computation(self):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 200, {'id': 1}
+
+        flight = SingleFlight()
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results = self.run_concurrently([flight] * 5, compute)
+        timer.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertTrue(all(result == (200, {'id': 1}) for result, _ in results))
+        self.assertEqual(flight.calls, {})
+
+        # Nothing is kept once the computation finished
+        flight.do('key', compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_workers_share_through_lock_file(self):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 200, {'id': 1}
+
+        # Separate SingleFlight instances behave like separate worker processes
+        workers = [SingleFlight(self.lock_dir) for _ in range(3)]
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results = self.run_concurrently(workers, compute)
+        timer.join()
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == (200, {'id': 1}) for result, _ in results))
+
+    def test_view_response_is_unchanged(self):
+        course = Course.objects.create(name='Test Course')
+        self.client.force_authenticate(user=self.viewer)
+        response = self.client.get(f'/api/admission/courses/{course.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Test Course')
+        self.assertNotIn('X-Coalesced', response)
+
+
+class TestStructuredLogging(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(username='admin', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.course = Course.objects.create(name='Test Course')
+
+    def test_access_log_record(self):
+        with self.assertLogs('apps.api.access', 'INFO') as logs:
+            self.client.get(f'/api/admission/courses/{self.course.id}/')
+        record = logs.records[-1]
+        self.assertEqual(record.view, 'api:retrieve_course')
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.user_id, self.user.id)
+        self.assertGreater(record.queries, 0)
+        self.assertGreaterEqual(record.latency_ms, 0)
+
+        line = json.loads(JsonFormatter().format(record))
+        self.assertEqual(line['level'], 'INFO')
+        self.assertEqual(line['message'], f'GET /api/admission/courses/{self.course.id}/ 200')
+        for field in ('view', 'status', 'latency_ms', 'queries', 'user_id', 'path', 'method'):
+            self.assertIn(field, line)
+
+    def make_record(self, level, msg):
+        return logging.makeLogRecord({'name': 'test', 'levelno': level, 'levelname': logging.getLevelName(level), 'msg': msg})
+
+    def test_background_handler_writes_batches(self):
+        stream = io.StringIO()
+        handler = BackgroundHandler(stream=stream, flush_interval=0.01)
+        handler.setFormatter(JsonFormatter())
+        for i in range(3):
+            handler.handle(self.make_record(logging.INFO, f'line {i}'))
+        self.assertIsNotNone(handler.writer)
+        handler.close()
+        self.assertFalse(handler.writer.is_alive())
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line['message'] for line in lines], ['line 0', 'line 1', 'line 2'])
+
+    def test_full_queue_drops_info_and_keeps_errors(self):
+        stream = io.StringIO()
+        handler = BackgroundHandler(stream=stream, queue_size=2)
+        handler.setFormatter(JsonFormatter())
+        # Enqueue without starting the writer, as if it had fallen behind
+        for i in range(3):
+            handler.enqueue(self.make_record(logging.INFO, f'info {i}'))
+        handler.enqueue(self.make_record(logging.ERROR, 'error'))
+        self.assertEqual(handler.dropped, 2)
+        handler.close()
+        messages = [json.loads(line)['message'] for line in stream.getvalue().splitlines()]
+        self.assertEqual(messages[:2], ['info 1', 'error'])
+        self.assertIn('Dropped 2 log records', messages[2])
+
+
+class TestDetailCache(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(username='admin', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.course = Course.objects.create(name='Test Course')
+        self.other_course = Course.objects.create(name='Other Course')
+        self.intake = Intake.objects.create(course=self.course, start_date='2023-01-01', end_date='2023-12-31')
+        self.course_url = f'/api/admission/courses/{self.course.id}/'
+        self.intake_url = f'{self.course_url}intakes/{self.intake.id}/'
+
+    def test_repeated_reads_are_served_from_cache(self):
+        first = self.client.get(self.course_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.course_url)
+        self.assertEqual(first.data, second.data)
+
+        self.client.get(self.intake_url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.intake_url).data['id'], self.intake.id)
+
+    def test_viewers_share_entries_and_others_bypass_them(self):
+        self.client.get(self.course_url)
+
+        viewer = User.objects.create_user(username='viewer', password='testpassword')
+        viewer.user_permissions.add(Permission.objects.get(codename='view_course'))
+        viewer = User.objects.get(id=viewer.id)
+        self.client.force_authenticate(user=viewer)
+        with self.assertNumQueries(2):  # Loading the user's permissions only
+            self.assertEqual(self.client.get(self.course_url).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=User.objects.create_user(username='nobody', password='testpassword'))
+        self.assertEqual(self.client.get(self.course_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_queueing_course_deletion_bumps_one_version(self):
+        Intake.objects.bulk_create([
+            Intake(course=self.course, start_date='2024-01-01', end_date='2024-12-31') for _ in range(50)
+        ])
+        self.client.get(self.intake_url)
+        with patch.object(cache, 'set_many', wraps=cache.set_many) as set_many, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'{self.course_url}delete/?async=true')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(all(len(call.args[0]) == 1 for call in set_many.call_args_list))
+        self.assertEqual(self.client.get(self.intake_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_changes_invalidate_only_the_affected_object(self):
+        self.client.get(self.course_url)
+        self.client.get(self.intake_url)
+
+        # Editing another course leaves this entry in place
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f'/api/admission/courses/{self.other_course.id}/update/', {'name': 'Renamed Other'}, format='json')
+        with self.assertNumQueries(0):
+            self.client.get(self.course_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f'{self.course_url}update/', {'name': 'Renamed'}, format='json')
+        self.assertEqual(self.client.get(self.course_url).data['name'], 'Renamed')
+
+        # Intake changes reach both the intake and the course embedding it
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f'{self.intake_url}update/', {'start_date': '2023-02-01', 'end_date': '2023-12-31'}, format='json')
+        self.assertEqual(self.client.get(self.intake_url).data['start_date'], '2023-02-01')
+        self.assertEqual(self.client.get(self.course_url).data['intakes'][0]['start_date'], '2023-02-01')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'{self.course_url}delete/')
+        self.assertEqual(self.client.get(self.course_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.intake_url).status_code, status.HTTP_404_NOT_FOUND)
@@ -11,6 +11,7 @@ urlpatterns = [
     # Course Endpoints
     path("admission/courses/", views.ListCourses.as_view(), name="list_courses"),
     path("admission/courses/create/", views.CreateCourse.as_view(), name="create_course"),
+    path("admission/courses/typeahead/", views.CourseTypeahead.as_view(), name="course_typeahead"),
     path("admission/courses/<int:course_id>/", views.RetrieveCourse.as_view(), name="retrieve_course"),
     path("admission/courses/<int:course_id>/update/", views.UpdateCourse.as_view(), name="update_course"),
     path("admission/courses/<int:course_id>/delete/", views.DeleteCourse.as_view(), name="delete_course"),
@@ -22,6 +23,17 @@ urlpatterns = [
     path("admission/courses/<int:course_id>/intakes/<int:intake_id>/update/", views.UpdateIntake.as_view(), name="update_intake"),
     path("admission/courses/<int:course_id>/intakes/<int:intake_id>/delete/", views.DeleteIntake.as_view(), name="delete_intake"),
 
+    # Bulk Write Endpoints (processed in the background by `manage.py run_jobs`)
+    path("admission/courses/bulk/", views.BulkCourses.as_view(), name="bulk_courses"),
+    path("admission/intakes/bulk/", views.BulkIntakes.as_view(), name="bulk_intakes"),
+    path("admission/jobs/<int:job_id>/", views.RetrieveJob.as_view(), name="retrieve_job"),
+
+    # Aggregation Endpoints
+    path("admission/intakes/calendar/", views.IntakeCalendar.as_view(), name="intake_calendar"),
+
+    # Delta Sync Endpoint
+    path("admission/changes/", views.ChangeFeed.as_view(), name="change_feed"),
+
     # JWT Authentication Endpoints
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
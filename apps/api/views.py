@@ -3,10 +3,27 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber, TruncDay, TruncMonth, TruncWeek
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.http import Http404
-from apps.admission.models import Course, Intake
-from .serializers import CourseSerializer, IntakeSerializer
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from apps.admission.deletion import delete_course
+from apps.admission.models import ArchivedIntake, CatalogChange, CatalogJob, Course, Intake
+from apps.admission.typeahead import course_index
+from .caching import cache_detail
+from .coalescing import coalesce
+from .renderers import COLUMNAR_RENDERER_CLASSES, to_columns, wants_columnar
+from .signals import INTAKE_CALENDAR_VERSION_KEY
+from .serializers import CatalogJobSerializer, CourseSerializer, IntakeSerializer
 
 # HealthCheck View
 class HealthCheck(APIView):
@@ -29,28 +46,108 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+# Bounded Intake Embedding
+
+INTAKE_ORDERINGS = {
+    'upcoming': ['start_date', 'id'],  # Only intakes starting today or later
+    'start_date': ['start_date', 'id'],
+    '-start_date': ['-start_date', '-id'],
+    'id': ['id'],
+}
+MAX_INTAKES_LIMIT = 100
+INVALID_INTAKES_LIMIT = {
+    "detail": f"`intakes_limit` must be between 1 and {MAX_INTAKES_LIMIT} and `intakes_order` one of: {', '.join(INTAKE_ORDERINGS)}."
+}
+ARCHIVED_WITH_INTAKES_LIMIT = {
+    "detail": "`include_archived` cannot be combined with `intakes_limit`, which only embeds current intakes."
+}
+
+
+def parse_intakes_limit(request):
+    """
+    Read `intakes_limit` and `intakes_order` (default 'upcoming') from the query string.
+    Returns (None, None) when no limit is requested; raises ValueError on invalid values.
+    """
+    if 'intakes_limit' not in request.query_params:
+        return None, None
+    limit = int(request.query_params['intakes_limit'])
+    order = request.query_params.get('intakes_order', 'upcoming')
+    if not 1 <= limit <= MAX_INTAKES_LIMIT or order not in INTAKE_ORDERINGS:
+        raise ValueError
+    return limit, order
+
+
+def bounded_intakes(limit, order):
+    """
+    Return a subquery counting each course's selected intakes (for `OuterRef('pk')`)
+    and the queryset of at most `limit` intakes per course, numbered with
+    ROW_NUMBER() OVER (PARTITION BY course_id).
+    """
+    selected = Intake.objects.all()
+    if order == 'upcoming':
+        selected = selected.filter(start_date__gte=timezone.localdate())
+    ordering = INTAKE_ORDERINGS[order]
+    counts = selected.filter(course=OuterRef('pk')).order_by().values('course').annotate(count=Count('id')).values('count')
+    ranked = (
+        selected.annotate(row_number=Window(RowNumber(), partition_by=F('course_id'), order_by=ordering))
+        .filter(row_number__lte=limit)
+        .order_by(*ordering)
+    )
+    return Coalesce(Subquery(counts), 0), ranked
+
+
+def with_bounded_intakes(courses, limit, order):
+    """
+    Annotate courses with `intakes_count` and prefetch at most `limit` intakes per
+    course into `bounded_intakes`, using one window function query.
+    """
+    counts, ranked = bounded_intakes(limit, order)
+    return courses.annotate(intakes_count=counts).prefetch_related(
+        Prefetch('intakes', queryset=ranked, to_attr='bounded_intakes')
+    )
+
+
 # Course Views
 class ListCourses(APIView):
     """
     Endpoint to list all courses.
-    Supports optional inclusion of intakes and pagination.
+    Supports optional inclusion of intakes (`with_intakes=true`), archived intakes
+    (`include_archived=true`), pagination and the columnar format (`format=columnar`).
+    With `intakes_limit=N` (and `intakes_order`) at most N current intakes are embedded per course.
     """
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    renderer_classes = COLUMNAR_RENDERER_CLASSES
 
+    @coalesce()
     def get(self, request, *args, **kwargs):
         try:
             with_intakes = request.query_params.get('with_intakes', 'false').lower() == 'true'
-
-            if with_intakes:
+            include_archived = request.query_params.get('include_archived', 'false').lower() == 'true'
+            try:
+                intakes_limit, intakes_order = parse_intakes_limit(request)
+            except ValueError:
+                return Response(INVALID_INTAKES_LIMIT, status=status.HTTP_400_BAD_REQUEST)
+            if with_intakes and intakes_limit and include_archived:
+                return Response(ARCHIVED_WITH_INTAKES_LIMIT, status=status.HTTP_400_BAD_REQUEST)
+            if wants_columnar(request):
+                return self.get_columnar(request, with_intakes, include_archived, intakes_limit, intakes_order)
+
+            if with_intakes and intakes_limit:
+                courses = with_bounded_intakes(Course.objects.order_by('id'), intakes_limit, intakes_order)
+            elif with_intakes and include_archived:
+                courses = Course.objects.prefetch_related('intakes', 'archived_intakes').order_by('id').all()
+            elif with_intakes:
                 courses = Course.objects.prefetch_related('intakes').order_by('id').all()
             else:
                 courses = Course.objects.order_by('id').all()
 
             paginator = self.pagination_class()
             page = paginator.paginate_queryset(courses, request)
-            if with_intakes:
-                serializer = CourseSerializer(page, many=True)
+            if with_intakes and intakes_limit:
+                serializer = CourseSerializer(page, many=True, bounded_intakes=True, context={'request': request})
+            elif with_intakes:
+                serializer = CourseSerializer(page, many=True, include_archived=include_archived)
             else:
                 serializer = CourseSerializer(page, many=True, exclude_intakes=True)
 
@@ -58,6 +155,64 @@ class ListCourses(APIView):
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_columnar(self, request, with_intakes, include_archived, intakes_limit=None, intakes_order=None):
+        """
+        Build the columnar page straight from `values_list` tuples.
+        Intakes are flattened into their own columns, `course_index` pointing into the course columns.
+        With `intakes_limit` the same per-course bound as the default format applies,
+        and an `intakes_count` course column is added.
+        """
+        paginator = self.pagination_class()
+        course_fields = ['id', 'name']
+        courses = Course.objects.order_by('id')
+        if with_intakes and intakes_limit:
+            counts, ranked = bounded_intakes(intakes_limit, intakes_order)
+            courses = courses.annotate(intakes_count=counts)
+            course_fields.append('intakes_count')
+        rows = paginator.paginate_queryset(courses.values_list(*course_fields), request)
+        results = to_columns(rows, course_fields)
+        if with_intakes:
+            positions = {course_id: position for position, course_id in enumerate(results['id'])}
+            fields = ['course_id', 'id', 'start_date', 'end_date']
+            if intakes_limit:
+                ordering = INTAKE_ORDERINGS[intakes_order]
+                intakes = ranked.filter(course_id__in=positions).values_list(*fields).order_by('course_id', *ordering)
+            else:
+                intakes = Intake.objects.filter(course_id__in=positions).values_list(*fields)
+                if include_archived:
+                    intakes = intakes.union(ArchivedIntake.objects.filter(course_id__in=positions).values_list(*fields))
+                intakes = intakes.order_by('course_id', 'id')
+            columns = to_columns(intakes, fields)
+            results['intakes'] = {
+                'course_index': [positions[course_id] for course_id in columns.pop('course_id')],
+                **columns,
+            }
+        return paginator.get_paginated_response(results)
+
+
+class CourseTypeahead(APIView):
+    """
+    Endpoint returning courses with a name word starting with `q`, for autocomplete.
+    Served from an in-process prefix index; `limit` caps the results (default 10, max 50).
+    Requires 'admission.view_course' permission.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        if not request.user.has_perm('admission.view_course'):
+            return Response({"detail": "You do not have permission to view courses."}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            return Response({"detail": "Invalid limit."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            matches = course_index.search(request.query_params.get('q', ''), limit=limit)
+            return Response({"results": [{"id": course_id, "name": name} for course_id, name in matches]}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 
 class CreateCourse(APIView):
     """
@@ -80,17 +235,35 @@ class CreateCourse(APIView):
 class RetrieveCourse(APIView):
     """
     Endpoint to retrieve a specific course by ID.
+    Pass `include_archived=true` to also list archived intakes, or `intakes_limit=N`
+    (and `intakes_order`) to embed at most N current intakes.
+    Responses are cached per course and shared by all viewers.
     Requires 'admission.view_course' permission.
     """
     permission_classes = [IsAuthenticated]
 
+    @cache_detail('course', 'admission.view_course', 'course_id')
+    @coalesce('admission.view_course')
     def get(self, request, course_id, *args, **kwargs):
         try:
-            course = get_object_or_404(Course, id=course_id)
+            try:
+                intakes_limit, intakes_order = parse_intakes_limit(request)
+            except ValueError:
+                return Response(INVALID_INTAKES_LIMIT, status=status.HTTP_400_BAD_REQUEST)
+            if intakes_limit and request.query_params.get('include_archived', 'false').lower() == 'true':
+                return Response(ARCHIVED_WITH_INTAKES_LIMIT, status=status.HTTP_400_BAD_REQUEST)
+            courses = Course.objects.all()
+            if intakes_limit:
+                courses = with_bounded_intakes(courses, intakes_limit, intakes_order)
+            course = get_object_or_404(courses, id=course_id)
             if not request.user.has_perm('admission.view_course'):
                 return Response({"detail": "You do not have permission to view this course."}, status=status.HTTP_403_FORBIDDEN)
             
-            serializer = CourseSerializer(course)
+            if intakes_limit:
+                serializer = CourseSerializer(course, bounded_intakes=True, context={'request': request})
+            else:
+                include_archived = request.query_params.get('include_archived', 'false').lower() == 'true'
+                serializer = CourseSerializer(course, include_archived=include_archived)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Http404:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
@@ -124,7 +297,8 @@ class UpdateCourse(APIView):
 
 class DeleteCourse(APIView):
     """
-    Endpoint to delete a specific course by ID.
+    Endpoint to delete a specific course by ID, with its intakes deleted in set-based chunks.
+    With `async=true` the course is hidden immediately and deleted by a background job (202 Accepted).
     Requires 'admission.delete_course' permission.
     """
     permission_classes = [IsAuthenticated]
@@ -135,7 +309,15 @@ class DeleteCourse(APIView):
             if not request.user.has_perm('admission.delete_course'):
                 return Response({"detail": "You do not have permission to delete this course."}, status=status.HTTP_403_FORBIDDEN)
             
-            course.delete()
+            if request.query_params.get('async', 'false').lower() == 'true':
+                with transaction.atomic():
+                    course.deleting = True
+                    course.save(update_fields=['deleting'])
+                    job = CatalogJob.objects.create(kind='delete_course', payload=[{'id': course.id}], total=1, created_by=request.user)
+                location = reverse('api:retrieve_job', kwargs={'job_id': job.id})
+                return Response(CatalogJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+            delete_course(course)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Http404:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
@@ -148,20 +330,36 @@ class DeleteCourse(APIView):
 class ListIntakes(APIView):
     """
     Endpoint to list all intakes for a specific course.
-    Supports pagination.
+    Supports pagination, optional inclusion of archived intakes (`include_archived=true`)
+    and the columnar format (`format=columnar`).
     """
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    renderer_classes = COLUMNAR_RENDERER_CLASSES
 
+    @coalesce('admission.view_intake')
     def get(self, request, course_id, *args, **kwargs):
         try:
             course = get_object_or_404(Course, id=course_id)
             if not request.user.has_perm('admission.view_intake'):
                 return Response({"detail": "You do not have permission to view these intakes."}, status=status.HTTP_403_FORBIDDEN)
             
-            intakes = course.intakes.order_by('id').all()
+            include_archived = request.query_params.get('include_archived', 'false').lower() == 'true'
+            fields = ['id', 'start_date', 'end_date']
+            columnar = wants_columnar(request)
+            if columnar:
+                intakes = course.intakes.values_list(*fields)
+                if include_archived:
+                    intakes = intakes.union(course.archived_intakes.values_list(*fields))
+                intakes = intakes.order_by('id')
+            elif include_archived:
+                intakes = course.intakes.values(*fields).union(course.archived_intakes.values(*fields)).order_by('id')
+            else:
+                intakes = course.intakes.order_by('id').all()
             paginator = self.pagination_class()
             page = paginator.paginate_queryset(intakes, request)
+            if columnar:
+                return paginator.get_paginated_response(to_columns(page, fields))
             serializer = IntakeSerializer(page, many=True)
             return paginator.get_paginated_response(serializer.data)
         except Exception as e:
@@ -193,13 +391,16 @@ class CreateIntake(APIView):
 class RetrieveIntake(APIView):
     """
     Endpoint to retrieve a specific intake by ID for a specific course.
+    Responses are cached per intake and shared by all viewers.
     Requires 'admission.view_intake' permission.
     """
     permission_classes = [IsAuthenticated]
 
+    @cache_detail('intake', 'admission.view_intake', 'intake_id', parent=('course', 'course_id'))
+    @coalesce('admission.view_intake')
     def get(self, request, course_id, intake_id, *args, **kwargs):
         try:
-            intake = get_object_or_404(Intake, course__id=course_id, id=intake_id)
+            intake = get_object_or_404(Intake, course__id=course_id, course__deleting=False, id=intake_id)
             if not request.user.has_perm('admission.view_intake'):
                 return Response({"detail": "You do not have permission to view this intake."}, status=status.HTTP_403_FORBIDDEN)
             
@@ -220,7 +421,7 @@ class UpdateIntake(APIView):
 
     def put(self, request, course_id, intake_id, *args, **kwargs):
         try:
-            intake = get_object_or_404(Intake, course__id=course_id, id=intake_id)
+            intake = get_object_or_404(Intake, course__id=course_id, course__deleting=False, id=intake_id)
             if not request.user.has_perm('admission.change_intake'):
                 return Response({"detail": "You do not have permission to update this intake."}, status=status.HTTP_403_FORBIDDEN)
             
@@ -244,7 +445,7 @@ class DeleteIntake(APIView):
 
     def delete(self, request, course_id, intake_id, *args, **kwargs):
         try:
-            intake = get_object_or_404(Intake, course__id=course_id, id=intake_id)
+            intake = get_object_or_404(Intake, course__id=course_id, course__deleting=False, id=intake_id)
             if not request.user.has_perm('admission.delete_intake'):
                 return Response({"detail": "You do not have permission to delete this intake."}, status=status.HTTP_403_FORBIDDEN)
             
@@ -253,4 +454,223 @@ class DeleteIntake(APIView):
         except Http404:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Delta Sync View
+
+class ChangeFeed(APIView):
+    """
+    Endpoint returning courses and intakes created, updated or deleted since a cursor.
+    Omit `since` to start a full sync; pass the returned `next_cursor` on the following call.
+    Requires 'admission.view_course' and 'admission.view_intake' permissions.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 100
+    max_limit = 1000
+
+    @staticmethod
+    def encode_cursor(change_id, as_of):
+        return f"{change_id}-{int(as_of.timestamp())}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        change_id, as_of = cursor.split('-')
+        return int(change_id), datetime.fromtimestamp(int(as_of), tz=dt_timezone.utc)
+
+    def get(self, request, *args, **kwargs):
+        if not (request.user.has_perm('admission.view_course') and request.user.has_perm('admission.view_intake')):
+            return Response({"detail": "You do not have permission to view catalog changes."}, status=status.HTTP_403_FORBIDDEN)
+
+        now = timezone.now()
+        since = request.query_params.get('since')
+        try:
+            since_id, as_of = self.decode_cursor(since) if since else (0, now)
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            if limit < 1:
+                raise ValueError
+        except (ValueError, OverflowError, OSError):  # fromtimestamp rejects out-of-range cursors
+            return Response({"detail": "Invalid cursor or limit."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # `as_of` is when the client's sync started; entries it has not read yet are newer
+        # than that, so they can only have been compacted if the sync is older than the retention window
+        if since_id and as_of < now - settings.CATALOG_TOMBSTONE_RETENTION:
+            return Response({"detail": "Cursor has expired, a full resync is required."}, status=status.HTTP_410_GONE)
+
+        try:
+            changes = list(CatalogChange.objects.filter(id__gt=since_id).order_by('id')[:limit + 1])
+            has_more = len(changes) > limit
+            changes = changes[:limit]
+
+            course_ids = [c.object_id for c in changes if c.object_type == CatalogChange.COURSE and not c.deleted]
+            intake_ids = [c.object_id for c in changes if c.object_type == CatalogChange.INTAKE and not c.deleted]
+            courses = Course.objects.in_bulk(course_ids)
+            intakes = Intake.objects.filter(course__deleting=False).in_bulk(intake_ids)
+
+            results = []
+            for change in changes:
+                item = {"type": change.object_type, "id": change.object_id, "deleted": change.deleted}
+                if change.object_type == CatalogChange.COURSE:
+                    obj = courses.get(change.object_id)
+                    data = CourseSerializer(obj, exclude_intakes=True).data if obj else None
+                else:
+                    item["course_id"] = change.course_id
+                    obj = intakes.get(change.object_id)
+                    data = IntakeSerializer(obj).data if obj else None
+                if not change.deleted and data is None:
+                    continue  # Deleted after this page was read; its tombstone follows later in the feed
+                item["data"] = data
+                results.append(item)
+
+            if has_more:
+                # Keep the sync's start time while paging: the rows themselves may be arbitrarily old
+                next_cursor = self.encode_cursor(changes[-1].id, as_of)
+            else:
+                next_cursor = self.encode_cursor(changes[-1].id if changes else since_id, now)
+
+            return Response({"next_cursor": next_cursor, "has_more": has_more, "results": results}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Aggregation Views
+
+class IntakeCalendar(APIView):
+    """
+    Endpoint returning intake counts per day, week or month of `start_date` within a date range.
+    Counts are computed by the database over current and archived intakes;
+    pass `group_by=course` to split them per course.
+    Ranges that ended before today are cached.
+    Requires 'admission.view_intake' permission.
+    """
+    permission_classes = [IsAuthenticated]
+    buckets = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+
+    @coalesce('admission.view_intake')
+    def get(self, request, *args, **kwargs):
+        if not request.user.has_perm('admission.view_intake'):
+            return Response({"detail": "You do not have permission to view these intakes."}, status=status.HTTP_403_FORBIDDEN)
+
+        bucket = request.query_params.get('bucket', 'month')
+        group_by_course = request.query_params.get('group_by') == 'course'
+        try:
+            start = parse_date(request.query_params.get('start', ''))
+            end = parse_date(request.query_params.get('end', ''))
+        except ValueError:
+            start = end = None
+        if bucket not in self.buckets or start is None or end is None or end < start:
+            return Response(
+                {"detail": "Provide valid `start` and `end` dates (YYYY-MM-DD) and a `bucket` of day, week or month."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            closed = end < timezone.localdate()
+            if closed:
+                version = cache.get_or_set(INTAKE_CALENDAR_VERSION_KEY, time.time_ns, None)
+                cache_key = f"intake_calendar:{version}:{bucket}:{start}:{end}:{int(group_by_course)}"
+                results = cache.get(cache_key)
+                if results is not None:
+                    return Response(self.build_response(bucket, start, end, results), status=status.HTTP_200_OK)
+
+            # Aggregate the hot and archive tables separately and add up the (small) results
+            fields = ['period', 'course_id'] if group_by_course else ['period']
+            counts = Counter()
+            for model in (Intake, ArchivedIntake):
+                rows = (
+                    model.objects.filter(start_date__range=(start, end), course__deleting=False)
+                    .annotate(period=self.buckets[bucket]('start_date'))
+                    .values(*fields)
+                    .annotate(count=Count('id'))
+                    .order_by()
+                )
+                for row in rows:
+                    counts[tuple(row[field] for field in fields)] += row['count']
+            results = [
+                dict(zip(fields, key), period=key[0].isoformat(), count=count)
+                for key, count in sorted(counts.items())
+            ]
+
+            if closed:
+                cache.set(cache_key, results, settings.INTAKE_CALENDAR_CACHE_TIMEOUT)
+            return Response(self.build_response(bucket, start, end, results), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def build_response(bucket, start, end, results):
+        return {"bucket": bucket, "start": start.isoformat(), "end": end.isoformat(), "results": results}
+
+
+# Bulk Write Views
+
+class BulkCatalogWrite(APIView):
+    """
+    Base endpoint queueing a list of items as a background CatalogJob.
+    Returns 202 Accepted with the job; poll the job status endpoint for progress.
+    Items with an `id` update that object and need the change permission,
+    the others are created and need the add permission.
+    """
+    permission_classes = [IsAuthenticated]
+    kind = None
+    items_key = None
+    add_permission = None
+    change_permission = None
+
+    def post(self, request, *args, **kwargs):
+        items = request.data.get(self.items_key) if hasattr(request.data, 'get') else None
+        if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+            return Response({"detail": f"`{self.items_key}` must be a non-empty list of objects."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.CATALOG_JOB_MAX_ITEMS:
+            return Response({"detail": f"At most {settings.CATALOG_JOB_MAX_ITEMS} items can be submitted per job."}, status=status.HTTP_400_BAD_REQUEST)
+
+        required = set()
+        for item in items:
+            required.add(self.change_permission if item.get('id') is not None else self.add_permission)
+        if not request.user.has_perms(required):
+            return Response({"detail": "You do not have permission to submit these changes."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            job = CatalogJob.objects.create(kind=self.kind, payload=items, total=len(items), created_by=request.user)
+            location = reverse('api:retrieve_job', kwargs={'job_id': job.id})
+            return Response(CatalogJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+        except Exception as e:
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkCourses(BulkCatalogWrite):
+    """
+    Endpoint to create or rename courses in bulk: {"courses": [{"name": ...}, {"id": ..., "name": ...}]}.
+    Requires 'admission.add_course' / 'admission.change_course' permissions.
+    """
+    kind = 'bulk_courses'
+    items_key = 'courses'
+    add_permission = 'admission.add_course'
+    change_permission = 'admission.change_course'
+
+
+class BulkIntakes(BulkCatalogWrite):
+    """
+    Endpoint to create or update intakes across courses in bulk:
+    {"intakes": [{"course_id": ..., "start_date": ..., "end_date": ...}, ...]}.
+    Requires 'admission.add_intake' / 'admission.change_intake' permissions.
+    """
+    kind = 'bulk_intakes'
+    items_key = 'intakes'
+    add_permission = 'admission.add_intake'
+    change_permission = 'admission.change_intake'
+
+
+class RetrieveJob(APIView):
+    """
+    Endpoint to report the status, progress and errors of a bulk job.
+    Only the user who submitted the job (or staff) can see it.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id, *args, **kwargs):
+        jobs = CatalogJob.objects.all() if request.user.is_staff else CatalogJob.objects.filter(created_by=request.user)
+        job = jobs.defer('payload').filter(id=job_id).first()
+        if job is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(CatalogJobSerializer(job).data, status=status.HTTP_200_OK)
\ No newline at end of file
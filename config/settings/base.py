@@ -46,11 +46,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.api.middleware.AccessLogMiddleware',  # Outermost, so shed requests are logged too
+    'apps.api.middleware.LoadSheddingMiddleware',  # Sheds load before any other work
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.api.middleware.ProfilingMiddleware',  # Opt-in per-request profiling for staff
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -156,3 +159,102 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+
+# Delta sync: how long tombstones of deleted courses/intakes are kept before
+# `manage.py compact_catalog_changes` removes them. Clients whose cursor is
+# older than this must resync from scratch.
+CATALOG_TOMBSTONE_RETENTION = timedelta(days=config("CATALOG_TOMBSTONE_RETENTION_DAYS", default=30, cast=int))
+
+# Cache backend. Invalidations (intake calendar, detail responses) only reach
+# other processes, such as other web workers and `manage.py run_jobs`, through a
+# shared backend, e.g. CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# with CACHE_LOCATION=/var/tmp/admission-cache. The default is per process.
+CACHE_BACKEND = config("CACHE_BACKEND", default='django.core.cache.backends.locmem.LocMemCache')
+SHARED_CACHE = CACHE_BACKEND != 'django.core.cache.backends.locmem.LocMemCache'
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config("CACHE_LOCATION", default=''),
+    },
+}
+
+# Intake calendar: how long (seconds) counts for ranges that ended before today
+# are cached. Changes to past-dated intakes invalidate the cache immediately in
+# every process sharing the cache backend; with the per-process default, changes
+# made by other processes show up after at most a minute.
+INTAKE_CALENDAR_CACHE_TIMEOUT = 60 * 60 * 24 if SHARED_CACHE else 60
+
+# Bulk catalog jobs: maximum number of items accepted in one submission.
+CATALOG_JOB_MAX_ITEMS = 10000
+
+# Seconds without a progress heartbeat after which a running job is considered
+# abandoned (e.g. its worker died) and put back in the queue.
+CATALOG_JOB_STALE_TIMEOUT = 300
+
+# Course typeahead: seconds between catch-ups of the in-process prefix index with
+# course changes made by other worker processes.
+COURSE_TYPEAHEAD_SYNC_INTERVAL = 5
+
+# Per-request profiling (apps.api.middleware.ProfilingMiddleware): staff can send
+# `X-Profile: 1` or `?profile=1` on any API request. A sample rate of N > 0 also
+# profiles 1 in N API requests automatically. Only the newest reports are kept.
+API_PROFILE_DIR = config("API_PROFILE_DIR", default=str(BASE_DIR / 'profiles'))
+API_PROFILE_SAMPLE_RATE = config("API_PROFILE_SAMPLE_RATE", default=0, cast=int)
+API_PROFILE_KEEP = 50
+
+# Load shedding (apps.api.middleware.LoadSheddingMiddleware), per worker process:
+# budget -> (max in-flight requests, max requests waiting for a slot). Waiting
+# requests give up after API_QUEUE_TIMEOUT seconds and get a 503 with
+# Retry-After: API_RETRY_AFTER.
+API_CONCURRENCY_LIMITS = {
+    'read': (32, 32),
+    'write': (4, 16),  # SQLite serializes writes, so more writers only queue on the database lock
+    'admin': (4, 8),
+}
+API_QUEUE_TIMEOUT = 0.5
+API_RETRY_AFTER = 1
+
+# Request coalescing (apps.api.coalescing): identical concurrent GETs wait up to
+# API_COALESCE_TIMEOUT seconds for the in-flight one. Set API_COALESCE_LOCK_DIR
+# to a directory shared by the workers to also coalesce across processes.
+API_COALESCE_TIMEOUT = 10
+API_COALESCE_LOCK_DIR = config("API_COALESCE_LOCK_DIR", default='')
+
+# Structured JSON logs. Handlers queue records for a background writer thread
+# (apps.api.logs.BackgroundHandler), which appends them in batches to the file
+# named by API_ACCESS_LOG / API_ERROR_LOG, or to stderr when unset. At most
+# LOG_QUEUE_SIZE records are buffered per handler; beyond that INFO records are dropped.
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'apps.api.logs.JsonFormatter'},
+    },
+    'handlers': {
+        'access': {
+            'class': 'apps.api.logs.BackgroundHandler',
+            'formatter': 'json',
+            'filename': config("API_ACCESS_LOG", default='') or None,
+            'queue_size': LOG_QUEUE_SIZE,
+        },
+        'error': {
+            'class': 'apps.api.logs.BackgroundHandler',
+            'formatter': 'json',
+            'level': 'WARNING',
+            'filename': config("API_ERROR_LOG", default='') or None,
+            'queue_size': LOG_QUEUE_SIZE,
+        },
+    },
+    'loggers': {
+        'apps.api.access': {'handlers': ['access'], 'level': 'INFO', 'propagate': False},
+        'django.request': {'handlers': ['error'], 'level': 'ERROR', 'propagate': False},
+        'apps': {'handlers': ['error'], 'level': 'WARNING'},
+    },
+}
+
+# Seconds a cached course/intake detail response lives (apps.api.caching). Edits
+# invalidate entries immediately in every process sharing the cache backend;
+# with the per-process default, edits made by other processes show up after at
+# most a few seconds.
+API_DETAIL_CACHE_TIMEOUT = 300 if SHARED_CACHE else 5
@@ -2,3 +2,12 @@ from .base import *
 
 SECRET_KEY = 'django-insecure-ie$*t(a8b4r10#$a4_d4!sgra(__ai%0d@5!k=#1rf5+7@wt2*'
 DEBUG = True
+
+# Development and tests: discard the JSON access log unless API_ACCESS_LOG is set
+# (runserver prints its own request lines), and only show errors on the console
+# with DEBUG on, like Django's default logging; the test runner turns DEBUG off.
+LOGGING['filters'] = {'require_debug_true': {'()': 'django.utils.log.RequireDebugTrue'}}
+if LOGGING['handlers']['access']['filename'] is None:
+    LOGGING['handlers']['access'] = {'class': 'logging.NullHandler'}
+if LOGGING['handlers']['error']['filename'] is None:
+    LOGGING['handlers']['error']['filters'] = ['require_debug_true']